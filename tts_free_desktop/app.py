@@ -7,8 +7,15 @@ TTS Free — Desktop (PyQt5)
 - Second choice: Piper TTS (en_GB-cori-high — UK female, offline, MIT)
 - eSpeak NG fallback is OFF by default (enable with a checkbox)
 - Spacebar/Next advances exactly one sentence
+- Auto mode plays sentences back to back from one audio stream (TTS_FREE_GAPLESS=0: one clip each)
+- Speaking speed 0.5-3x (TTS_FREE_SPEED): Piper length_scale, Coqui length_scale, eSpeak rate,
+  otherwise a WSOLA time-stretch; applied when a sentence is synthesized, cached per speed
 - Wayland-safe: forces Qt to XCB when EGL/Wayland missing
 - Debugging: set TTS_FREE_DEBUG=1 for verbose logs
+- Headless export: python app.py export in.docx out.wav|.ogg|.mp3 (see --help)
+- Synthesized sentences are cached in ~/.cache/tts_free/wav (TTS_FREE_CACHE_MB caps it, 0 disables)
+- Temporary WAVs live in a per-run spool dir (tmpfs when available) and are deleted once played and evicted
+- Per-stage latency histograms: Help > Pipeline metrics (TTS_FREE_METRICS_JSONL / TTS_FREE_METRICS_PROM export them)
 
 License: MIT (this app)
 Coqui: MPL-2.0 (model from VCTK, CC BY 4.0, requires attribution)
@@ -16,15 +23,22 @@ Piper: MIT (models in rhasspy/piper-voices are free)
 """
 
 from __future__ import annotations
-import os
+import os, time
+_T0 = time.perf_counter()  # process start, for the startup-time log
 os.environ.setdefault("QT_QPA_PLATFORM", "xcb")  # Wayland/EGL quirks
 
-import re, sys, csv, shutil, tempfile, threading, subprocess, json, platform as pyplat
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import re, sys, csv, math, mmap, heapq, itertools, argparse, multiprocessing, shutil, struct, wave, tempfile, threading, subprocess, json, queue, atexit, hashlib, importlib.util, platform as pyplat
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QAudio, QAudioFormat, QAudioOutput
 from PyQt5.QtCore import QUrl
 
 try:
@@ -32,8 +46,15 @@ try:
 except Exception:
     Document = None
 
+try:
+    import numpy as np
+except Exception:
+    np = None
+
 DEBUG = bool(int(os.environ.get("TTS_FREE_DEBUG", "0") or "0"))
 
+COQUI_VOICE = "Coqui (VCTK p240 — UK female)"
+
 # --- Piper UK female voices you have on disk ---
 PIPER_VOICES = {
     "Piper (en_GB — Cori, high)": "en_GB-cori-high",
@@ -41,6 +62,51 @@ PIPER_VOICES = {
     "Piper (en_GB — Southern English Female, low)": "en_GB-southern_english_female-low",
 }
 
+# --- Synthesis cache (WAVs keyed by backend/voice/text); TTS_FREE_CACHE_MB=0 disables ---
+CACHE_DIR = os.environ.get("TTS_FREE_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "tts_free", "wav")
+CACHE_MB = int(os.environ.get("TTS_FREE_CACHE_MB", "1024") or "0")
+
+# --- Reading sessions (last position, voice, pronunciation file per document) ---
+SESSION_FILE = os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config"),
+                            "tts_free", "sessions.json")
+SESSION_MAX = 200  # documents remembered
+
+# --- Prefetch: sentences synthesized ahead of the current one, and threads doing it.
+# With TTS_FREE_ADAPTIVE (default on) these are starting values: both follow the
+# backend's measured realtime factor, between 1 and LOOKAHEAD_MAX / PREFETCH_WORKERS ---
+LOOKAHEAD = max(1, int(os.environ.get("TTS_FREE_LOOKAHEAD", "3") or "3"))
+LOOKAHEAD_MAX = max(LOOKAHEAD, int(os.environ.get("TTS_FREE_LOOKAHEAD_MAX", "8") or "8"))
+PREFETCH_WORKERS = max(1, int(os.environ.get("TTS_FREE_PREFETCH_WORKERS", "2") or "2"))
+ADAPTIVE = os.environ.get("TTS_FREE_ADAPTIVE", "1") != "0"
+RTF_HEADROOM = 1.5  # buffer this much more audio than the expected synthesis time
+KEEP_BEHIND = max(0, int(os.environ.get("TTS_FREE_KEEP_BEHIND", "3") or "0"))  # played sentences kept for Back
+# Auto mode plays ready sentences back to back from one audio stream (0 = one clip each),
+# with this much silence between them (also the export default)
+GAPLESS = os.environ.get("TTS_FREE_GAPLESS", "1") != "0"
+PAUSE_MS = max(0, int(os.environ.get("TTS_FREE_PAUSE_MS", "250") or "0"))
+# Speaking speed (1.0 = the voice's own pace), applied at synthesis time
+SPEED = min(3.0, max(0.5, float(os.environ.get("TTS_FREE_SPEED", "1") or "1")))
+# Coqui model copies in separate processes (1 = in-process, the classic behaviour)
+COQUI_WORKERS = max(1, int(os.environ.get("TTS_FREE_COQUI_WORKERS", "1") or "1"))
+# Sentences per padded VITS forward pass (prefetch and export); 1 turns batching off
+BATCH_SIZE = max(1, int(os.environ.get("TTS_FREE_BATCH", "4") or "1"))
+# Sentence packing (characters): fragments under PACK_MIN are voiced together with their
+# neighbours up to PACK_TARGET; sentences over PACK_MAX are voiced clause by clause
+PACK_MIN = int(os.environ.get("TTS_FREE_PACK_MIN", "24") or "0")
+PACK_TARGET = max(PACK_MIN, int(os.environ.get("TTS_FREE_PACK_TARGET", "160") or "0"))
+PACK_MAX = max(PACK_TARGET, int(os.environ.get("TTS_FREE_PACK_MAX", "300") or "0"))
+
+# --- Temp WAV spool (per-process dir, on tmpfs when available); TTS_FREE_SPOOL_MB caps it ---
+SPOOL_BASE = os.environ.get("TTS_FREE_SPOOL_DIR") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir())
+SPOOL_MB = max(16, int(os.environ.get("TTS_FREE_SPOOL_MB", "256") or "256"))
+
+# --- Pipeline metrics: every span appended to a JSON-lines file, and/or a Prometheus
+# text file rewritten every 15 s (node_exporter textfile collector) ---
+METRICS_JSONL = os.environ.get("TTS_FREE_METRICS_JSONL", "")
+METRICS_PROM = os.environ.get("TTS_FREE_METRICS_PROM", "")
+
 # ---------- Utils ----------
 def log(msg: str) -> None:
     if DEBUG:
@@ -57,14 +123,475 @@ def read_text(path: str) -> str:
         return "\n".join(p.text for p in Document(path).paragraphs)
     raise RuntimeError("Please choose a .txt or .docx file")
 
-def split_sentences(text: str) -> List[str]:
-    cleaned = (text or "").strip()
-    if not cleaned:
-        return []
-    parts = re.split(r"(?<=[.!?])\s+|\n+", cleaned)
-    return [p for p in (s.strip() for s in parts) if p]
+# Sentence segmentation: a regex finds candidate breaks (terminators, optional closing
+# quotes/brackets, whitespace; or a line break) and a few O(1) rules reject the false
+# ones, so the whole scan stays linear. A line break always ends a sentence: the
+# readers and the index cut documents at line breaks. The pattern starts with one
+# character class so the regex engine can skip ahead to candidates at C speed.
+_SENT_CAND = re.compile(r"([.!?\u2026\n])(?:(?<=\n)\n*|([.!?\u2026]*)[\"'\u201d\u2019)\]]*(\s+))")
+_WORD_BEFORE = re.compile(r"[\w.]{1,12}\Z")
+# "Dr. Smith", "e.g. this": a full stop after these never ends a sentence
+_ABBREV = frozenset("""mr mrs ms mx dr prof sr jr st mt ft rev fr hon gen col maj capt lt sgt cpl
+    cmdr adm gov pres sen rep supt insp messrs mme mlle e.g i.e cf viz vs approx ca al
+    dept est univ assn bros jan feb mar apr jun jul aug sep sept oct nov dec""".split())
+# "No. 5", "p. 12", "Fig. 3": only before a number
+_ABBREV_NUM = frozenset("no nos vol vols p pp ch chap sec sect fig figs eq eqs art ed op".split())
+# "U.S. Army": dotted acronyms that also work as adjectives; any other acronym before a
+# capital ends its sentence ("in the U.S. It is", "at 5 p.m. Then we"), and so do these
+# before a word that usually opens one
+_ACRONYM_PREFIX = frozenset("u.s u.k u.n e.u".split())
+_OPENER = re.compile(r"(?:It|The|He|She|We|They|I|This|That|There|Then|But|And|So|A|An|In|On)\b")
+
+def _abbrev_stop(text: str, start: int, dot: int, at: int) -> bool:
+    """Is the full stop at text[dot] part of an abbreviation, initial or list number
+    rather than the end of the sentence that began at start? text[at] opens the next
+    word."""
+    nxt = text[at]
+    m = _WORD_BEFORE.search(text, max(start, dot - 12), dot)
+    if m is None:
+        return False
+    word = m.group()
+    low = word.lower()
+    if low in _ABBREV or (low in _ABBREV_NUM and nxt.isdigit()):
+        return True
+    if word.isdigit():
+        return m.start() == start  # "1. Introduction"
+    if len(word) == 1:
+        return word.isupper() and word != "I"  # initials: "J. R. R. Tolkien"
+    if "." not in word or not word.replace(".", "").isalpha():
+        return False
+    if not nxt.isupper():
+        return True  # dotted acronyms: "U.S. $5", "5 p.m. (sharp)"
+    return low in _ACRONYM_PREFIX and not _OPENER.match(text, at)
+
+def sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """(start, end) character offsets of the stripped, non-empty sentences in text."""
+    pos, n = 0, len(text)
+    while pos < n and text[pos].isspace():
+        pos += 1
+    for m in _SENT_CAND.finditer(text, pos):
+        first, more, ws = m.groups()
+        e = m.end()
+        if first == "\n":
+            end = m.start()
+            while end > pos and text[end - 1].isspace():
+                end -= 1
+        else:
+            end = m.start(3)  # closing quotes/brackets stay with their sentence
+            if e < n and "\n" not in ws:
+                nxt = text[e]
+                # "…he said. and then", "\"Stop!\" she cried", "wait... what"
+                if nxt.islower() or (first == "." and not more and _abbrev_stop(text, pos, m.start(), e)):
+                    continue
+        if end > pos:
+            yield pos, end
+        pos = e
+        while pos < n and text[pos].isspace():
+            pos += 1
+    end = n
+    while end > pos and text[end - 1].isspace():
+        end -= 1
+    if end > pos:
+        yield pos, end
 
-def load_pron_csv(path: str) -> List[Tuple[str, str]]:
+def split_sentences(text: str) -> List[str]:
+    text = text or ""
+    return [text[a:b] for a, b in sentence_spans(text)]
+
+READ_BLOCK = 64 * 1024  # characters per buffered .txt read
+
+def iter_text_blocks(path: str) -> Iterator[str]:
+    """Document text in pieces that end on a line break: buffered reads for .txt,
+    one paragraph at a time for .docx. Sentences never span a line break, so each
+    piece can be segmented on its own."""
+    low = path.lower()
+    if low.endswith(".txt"):
+        with open(path, "r", encoding="utf-8") as f:
+            tail = ""
+            while True:
+                chunk = f.read(READ_BLOCK)
+                if not chunk:
+                    break
+                chunk = tail + chunk
+                cut = chunk.rfind("\n") + 1
+                tail = chunk[cut:]
+                if cut:
+                    yield chunk[:cut]
+            if tail:
+                yield tail
+    elif low.endswith(".docx") and Document:
+        for p in Document(path).paragraphs:
+            yield p.text + "\n"
+    else:
+        raise RuntimeError("Please choose a .txt or .docx file")
+
+def iter_sentences(path: str) -> Iterator[str]:
+    """split_sentences(read_text(path)), produced lazily."""
+    for block in iter_text_blocks(path):
+        yield from split_sentences(block)
+
+class LazySentences:
+    """Sentence list filled from a generator on demand, so playback can start before
+    the rest of the document has been read. len() counts what has been read so far."""
+
+    def __init__(self, source: Iterable[str] = (), head: Iterable[str] = ()) -> None:
+        self._items: List[str] = list(head)
+        self._src = iter(source)
+        self._done = False
+        self._lock = threading.Lock()  # generators can't be advanced from two threads
+
+    def has(self, i: int) -> bool:
+        with self._lock:
+            while len(self._items) <= i and not self._done:
+                try:
+                    self._items.append(next(self._src))
+                except StopIteration:
+                    self._done = True
+            return 0 <= i < len(self._items)
+
+    def __getitem__(self, i: int) -> str:
+        if not self.has(i):
+            raise IndexError(i)
+        return self._items[i]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def find(self, needle: str, start: int = 0) -> Optional[int]:
+        """First sentence at or after start containing needle (case-insensitive), wrapping around."""
+        self.has(sys.maxsize)  # read everything
+        low = needle.lower()
+        n = len(self._items)
+        for k in range(n):
+            i = (start + k) % n
+            if low in self._items[i].lower():
+                return i
+        return None
+
+    def close(self) -> None:
+        pass
+
+# ---------- Metrics ----------
+class Metrics:
+    """Timing spans per pipeline stage, aggregated into Prometheus-style histograms
+    (plus the most recent samples, for percentiles), and gauges for values that are
+    not durations. Thread-safe; the numbers are cheap enough to collect always,
+    unlike the DEBUG log."""
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    RECENT = 256
+
+    def __init__(self, jsonl: str = "") -> None:
+        self._counts: Dict[str, List[int]] = {}  # stage -> per-bucket counts (last one is +Inf)
+        self._sums: Dict[str, float] = {}
+        self._recent: Dict[str, deque] = {}
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}  # (name, labels) -> last value
+        self._lock = threading.Lock()
+        self._jsonl = jsonl
+        self._fh = None
+
+    def observe(self, stage: str, sec: float, **labels) -> None:
+        with self._lock:
+            counts = self._counts.get(stage)
+            if counts is None:
+                counts = self._counts[stage] = [0] * (len(self.BUCKETS) + 1)
+                self._sums[stage] = 0.0
+                self._recent[stage] = deque(maxlen=self.RECENT)
+            counts[bisect_left(self.BUCKETS, sec)] += 1
+            self._sums[stage] += sec
+            self._recent[stage].append(sec)
+            if self._jsonl:
+                try:
+                    if self._fh is None:
+                        self._fh = open(self._jsonl, "a", encoding="utf-8", buffering=1)
+                    self._fh.write(json.dumps({"t": round(time.time(), 3), "stage": stage,
+                                               "ms": round(sec * 1000, 3), **labels}) + "\n")
+                except OSError as e:
+                    log(f"Metrics log disabled: {e}")
+                    self._jsonl = ""
+
+    def gauge(self, name: str, value: float, **labels) -> None:
+        """Set a unitless current value, e.g. realtime_factor per backend."""
+        with self._lock:
+            self._gauges[(name, tuple(sorted((k, str(v)) for k, v in labels.items())))] = value
+
+    def gauges(self) -> List[dict]:
+        with self._lock:
+            return [{"gauge": name, **dict(labels), "value": v} for (name, labels), v in sorted(self._gauges.items())]
+
+    @contextmanager
+    def span(self, stage: str, **labels) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0, **labels)
+
+    def summary(self) -> List[dict]:
+        """Per stage: count, total, mean, p50/p95 (of the recent samples) and max, in seconds."""
+        out = []
+        with self._lock:
+            for stage in sorted(self._counts):
+                recent = sorted(self._recent[stage])
+                n = sum(self._counts[stage])
+                out.append({"stage": stage, "count": n, "sum": self._sums[stage], "mean": self._sums[stage] / n,
+                            "p50": recent[len(recent) // 2], "p95": recent[min(len(recent) - 1, len(recent) * 95 // 100)],
+                            "max": recent[-1]})
+        return out
+
+    def jsonl(self) -> str:
+        return "".join(json.dumps(row) + "\n" for row in self.summary() + self.gauges())
+
+    def prometheus(self) -> str:
+        lines = ["# HELP tts_free_stage_seconds Time spent per pipeline stage.",
+                 "# TYPE tts_free_stage_seconds histogram"]
+        with self._lock:
+            for stage in sorted(self._counts):
+                acc = 0
+                for le, c in zip([*map(str, self.BUCKETS), "+Inf"], self._counts[stage]):
+                    acc += c
+                    lines.append(f'tts_free_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {acc}')
+                lines.append(f'tts_free_stage_seconds_sum{{stage="{stage}"}} {self._sums[stage]:.6f}')
+                lines.append(f'tts_free_stage_seconds_count{{stage="{stage}"}} {acc}')
+            typed = set()
+            for (name, labels), v in sorted(self._gauges.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE tts_free_{name} gauge")
+                quoted = ",".join(k + '="' + val.replace("\\", "\\\\").replace('"', '\\"') + '"'
+                                  for k, val in labels)
+                lines.append(f"tts_free_{name}{{{quoted}}} {v:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._recent.clear()
+            self._gauges.clear()
+
+METRICS = Metrics(METRICS_JSONL)
+
+# ---------- Sentence index ----------
+# A document's sentences as (byte offset, byte length) pairs into a memory-mapped
+# UTF-8 file. The index is built lazily as playback needs it and finished in the
+# background, then saved as a sidecar (<doc>.ttsidx) that is reused while the
+# document's size and mtime are unchanged. .docx text is extracted to <doc>.ttstext.
+INDEX_BLOCK = 1 << 20  # bytes scanned per step
+FIND_BLOCK = 4 << 20  # bytes searched per lock hold
+_INDEX_MAGIC = b"TTSIDX3\n"  # bump whenever sentence_spans changes its output
+
+def _sidecar_path(src: str, suffix: str) -> str:
+    """<src><suffix> next to the document, or under the cache dir if that folder is read-only."""
+    beside = src + suffix
+    if os.path.exists(beside) or os.access(os.path.dirname(os.path.abspath(src)), os.W_OK):
+        return beside
+    digest = hashlib.sha1(os.path.abspath(src).encode("utf-8")).hexdigest()
+    return os.path.join(os.path.dirname(CACHE_DIR), "index", digest + suffix)
+
+def _write_atomic(path: str, chunks: Iterable[bytes]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    part = f"{path}.{os.getpid()}.part"
+    with open(part, "wb") as f:
+        for c in chunks:
+            f.write(c)
+    os.replace(part, path)
+
+class SentenceIndex:
+    """Random access to sentence N in O(1) while holding only offsets in memory.
+    Same interface as LazySentences: has(i), [i], len() (sentences indexed so far)."""
+
+    def __init__(self, path: str, head: Iterable[str] = ()) -> None:
+        low = path.lower()
+        if not (low.endswith(".txt") or (low.endswith(".docx") and Document)):
+            raise RuntimeError("Please choose a .txt or .docx file")
+        st = os.stat(path)
+        self._stamp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self._head = list(head)
+        self._starts = array("Q")
+        self._lens = array("I")
+        self._lock = threading.Lock()
+        self._done = self._closed = False
+        self._idx_path = _sidecar_path(path, ".ttsidx")
+        loaded = self._load()
+
+        text_path = path
+        if low.endswith(".docx"):
+            text_path = _sidecar_path(path, ".ttstext")
+            if not (loaded and os.path.isfile(text_path)):
+                _write_atomic(text_path, ((p.text + "\n").encode("utf-8")
+                                          for p in Document(path).paragraphs))
+        self._f = open(text_path, "rb")
+        self._size = os.fstat(self._f.fileno()).st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+        self._pos = 3 if self._mm[:3] == b"\xef\xbb\xbf" else 0  # skip a UTF-8 BOM
+        if self._size == 0:
+            self._done = True
+        log(f"Sentence index for {path}: {'reused ' + str(len(self._starts)) if loaded else 'building'}")
+
+    def _load(self) -> bool:
+        try:
+            with open(self._idx_path, "rb") as f:
+                if f.readline() != _INDEX_MAGIC:
+                    return False
+                hdr = json.loads(f.readline())
+                if {k: hdr.get(k) for k in self._stamp} != self._stamp:
+                    return False
+                self._starts.fromfile(f, hdr["n"])
+                self._lens.fromfile(f, hdr["n"])
+        except (OSError, ValueError, EOFError, KeyError):
+            self._starts, self._lens = array("Q"), array("I")
+            return False
+        self._done = True
+        return True
+
+    def _save(self) -> None:
+        hdr = dict(self._stamp, n=len(self._starts))
+        try:
+            _write_atomic(self._idx_path, [_INDEX_MAGIC, json.dumps(hdr).encode() + b"\n",
+                                           self._starts.tobytes(), self._lens.tobytes()])
+        except OSError as e:
+            log(f"Could not save sentence index: {e}")
+
+    def _scan_block(self) -> None:
+        # cut the block at a line break: sentences never span one
+        end = min(self._size, self._pos + INDEX_BLOCK)
+        if end < self._size:
+            nl = self._mm.rfind(b"\n", self._pos, end)
+            if nl < 0:
+                nl = self._mm.find(b"\n", end)
+            end = self._size if nl < 0 else nl + 1
+        raw = self._mm[self._pos:end]
+        # surrogateescape keeps a 1:1 char<->byte mapping even for invalid UTF-8
+        text = raw.decode("utf-8", "surrogateescape")
+        single_byte = len(raw) == len(text)
+        cb = cc = 0
+        for a, b in sentence_spans(text):
+            if single_byte:
+                start, n = a, b - a
+            else:
+                cb += len(text[cc:a].encode("utf-8", "surrogateescape"))
+                start, n = cb, len(text[a:b].encode("utf-8", "surrogateescape"))
+                cb, cc = cb + n, b
+            self._starts.append(self._pos + start)
+            self._lens.append(n)
+        self._pos = end
+        if end >= self._size:
+            self._done = True
+            self._save()
+
+    def has(self, i: int) -> bool:
+        j = i - len(self._head)
+        if j < 0:
+            return i >= 0
+        with self._lock:
+            while len(self._starts) <= j and not self._done and not self._closed:
+                self._scan_block()
+            return j < len(self._starts)
+
+    def complete(self) -> None:
+        """Index the rest of the document (background thread), one block per lock hold."""
+        while True:
+            with self._lock:
+                if self._done or self._closed:
+                    return
+                self._scan_block()
+
+    def __getitem__(self, i: int) -> str:
+        if not self.has(i):
+            raise IndexError(i)
+        if i < len(self._head):
+            return self._head[i]
+        j = i - len(self._head)
+        with self._lock:
+            start, n = self._starts[j], self._lens[j]
+            return self._mm[start:start + n].decode("utf-8", "replace")
+
+    def __len__(self) -> int:
+        return len(self._head) + len(self._starts)
+
+    def find(self, needle: str, start: int = 0) -> Optional[int]:
+        """First sentence at or after start containing needle, wrapping around. Searches the
+        mapped bytes directly (case folding is ASCII-only) and maps hits back with bisect.
+        The scan goes FIND_BLOCK bytes per lock hold, so readers (and the GIL) get a turn."""
+        self.complete()
+        pat = needle.encode("utf-8")
+        rx = re.compile(re.escape(pat), re.IGNORECASE)
+        h = len(self._head)
+        with self._lock:
+            if self._closed or not self._starts:
+                return None
+            j0 = max(0, start - h)
+            begin = self._starts[j0] if j0 < len(self._starts) else self._size
+        for lo, hi in ((begin, self._size), (0, begin)):
+            for a in range(lo, hi, FIND_BLOCK):
+                b = min(hi, a + FIND_BLOCK)
+                with self._lock:
+                    if self._closed:
+                        return None
+                    # overlap the next block so a hit straddling b is still seen
+                    for m in rx.finditer(self._mm, a, min(hi, b + len(pat) - 1)):
+                        if m.start() >= b:
+                            break
+                        j = bisect_right(self._starts, m.start()) - 1
+                        if j >= 0 and m.end() <= self._starts[j] + self._lens[j]:
+                            return j + h
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if isinstance(self._mm, mmap.mmap):
+                self._mm.close()
+            self._f.close()
+
+def _trie_regex(words: List[str]) -> str:
+    """One regex matching any of words. Shared prefixes are factored into a trie, so
+    matching costs O(term length) per position instead of O(number of terms); optional
+    tails keep the longest alternative first."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a word
+
+    def walk(node: dict) -> str:
+        branches = [re.escape(ch) + walk(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return walk(trie)
+
+class PronRules:
+    """Pronunciation rules compiled once into a single case-insensitive pattern.
+    Terms are matched on word boundaries in one pass over the text; when terms
+    overlap the longest wins, and for duplicate terms the first rule wins."""
+
+    def __init__(self, rules: List[Tuple[str, str]], source: Optional[str] = None) -> None:
+        self.rules = list(rules)
+        self.source = source  # CSV path, if loaded from one
+        self.digest = hashlib.sha1(json.dumps(self.rules, ensure_ascii=False).encode("utf-8")).hexdigest()
+        self._map: Dict[str, str] = {}
+        for term, rep in self.rules:
+            self._map.setdefault(term.lower(), rep)
+        self._rx = (re.compile(rf"\b{_trie_regex(list(self._map))}\b", re.IGNORECASE)
+                    if self._map else None)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _sub(self, m: "re.Match") -> str:
+        return self._map.get(m.group(0).lower(), m.group(0))
+
+    def apply(self, text: str) -> str:
+        return self._rx.sub(self._sub, text) if self._rx is not None else text
+
+def load_pron_csv(path: str) -> PronRules:
     rules: List[Tuple[str, str]] = []
     with open(path, "r", encoding="utf-8") as f:
         for row in csv.DictReader(f):
@@ -72,54 +599,663 @@ def load_pron_csv(path: str) -> List[Tuple[str, str]]:
             rep = (row.get("replacement") or "").strip()
             if t and rep:
                 rules.append((t, rep))
-    return rules
+    return PronRules(rules, source=os.path.abspath(path))
+
+def apply_pron(text: str, rules) -> str:
+    """Apply PronRules (or a plain list of (term, replacement) pairs, compiled on the fly)."""
+    if not isinstance(rules, PronRules):
+        rules = PronRules(rules)
+    return rules.apply(text)
+
+# ---------- PCM helpers ----------
+# In-memory audio is a mono int16 numpy array plus its sample rate.
+Pcm = Tuple["np.ndarray", int]
+PCM_CHUNK = 4096  # samples per chunk when streaming
+
+def _need_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for in-memory audio")
+
+def to_int16(samples) -> "np.ndarray":
+    """Float samples in [-1, 1] (list or array) -> int16 array; int16 passes through."""
+    _need_numpy()
+    a = np.asarray(samples)
+    if a.dtype == np.int16:
+        return a
+    return (np.clip(a.astype(np.float32), -1.0, 1.0) * 32767.0).astype(np.int16)
+
+def _wav_header(data: bytes) -> Tuple[int, int, int, int]:
+    """Parse a RIFF/WAVE header -> (sample_rate, channels, sample_width, data_offset).
+    The data chunk size is ignored, since streamed WAVs (eSpeak --stdout) leave it bogus."""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV stream")
+    pos, fmt = 12, None
+    while pos + 8 <= len(data):
+        cid, size = data[pos:pos + 4], struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        if cid == b"fmt ":
+            _, channels, rate, _, _, bits = struct.unpack("<HHIIHH", data[pos + 8:pos + 24])
+            fmt = (rate, channels, bits // 8)
+        elif cid == b"data":
+            if fmt is None:
+                break
+            return fmt + (pos + 8,)
+        pos += 8 + size + (size & 1)
+    raise ValueError("Truncated WAV header")
+
+def pcm_from_wav_bytes(data: bytes) -> Pcm:
+    _need_numpy()
+    rate, channels, width, off = _wav_header(data)
+    if width != 2:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+    body = data[off:]
+    a = np.frombuffer(body[:len(body) - len(body) % (2 * channels)], dtype=np.int16)
+    if channels > 1:
+        a = a.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return a, rate
+
+def read_wav_pcm(path: str) -> Pcm:
+    with open(path, "rb") as f:
+        return pcm_from_wav_bytes(f.read())
+
+def wav_seconds(path: str) -> float:
+    """Duration of a WAV file from its header (0.0 if unreadable)."""
+    try:
+        with wave.open(path, "rb") as w:
+            return w.getnframes() / float(w.getframerate() or 1)
+    except (OSError, EOFError, wave.Error):
+        return 0.0
+
+def write_wav_pcm(path: str, samples: "np.ndarray", rate: int) -> str:
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(to_int16(samples).tobytes())
+    return path
+
+def time_stretch(pcm: "np.ndarray", rate: int, speed: float) -> "np.ndarray":
+    """Play pcm speed times faster at the same pitch (WSOLA). Output frames of 30 ms are
+    overlap-added at half a frame; each is taken near its nominal input position, shifted
+    by up to 8 ms to line up with the previous frame's natural continuation."""
+    _need_numpy()
+    if abs(speed - 1.0) < 1e-3 or not len(pcm):
+        return pcm
+    n = max(64, int(rate * 0.03) // 2 * 2)
+    hs, tol = n // 2, int(rate * 0.008)
+    ha = hs * speed  # input advance per output frame
+    total = int(round(len(pcm) / speed))
+    k = total // hs + 2
+    x = np.concatenate([np.zeros(tol, np.float32), pcm.astype(np.float32),
+                        np.zeros(int(k * ha) + n + 2 * tol, np.float32)])
+    win = np.lib.stride_tricks.sliding_window_view(x, hs)
+    pos = np.empty(k, dtype=np.int64)
+    pos[0] = tol
+    for i in range(1, k):
+        c = tol + int(i * ha)
+        cand = win[c - tol:c + tol + 1]  # all candidate starts, correlated in one product
+        pos[i] = c - tol + int(np.argmax(cand @ x[pos[i - 1] + hs:pos[i - 1] + n]))
+    frames = x[pos[:, None] + np.arange(n)] * np.hanning(n + 1)[:-1].astype(np.float32)
+    out = np.zeros((k + 1) * hs, np.float32)  # periodic Hann at 50% overlap sums to 1
+    out[:k * hs] += frames[:, :hs].ravel()
+    out[hs:] += frames[:, hs:].ravel()
+    return np.clip(out[:total], -32768, 32767).astype(np.int16)
+
+def _iter_stdout_pcm(cmd: List[str], stdin: Optional[bytes], rate: Optional[int]) -> Iterator[Pcm]:
+    """Run cmd and yield int16 chunks from its stdout as they arrive. With rate=None the
+    stream starts with a WAV header, which supplies the rate."""
+    _need_numpy()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE)
+    try:
+        if stdin is not None:
+            proc.stdin.write(stdin)
+            proc.stdin.close()
+        buf = b""
+        while rate is None:
+            more = proc.stdout.read(256)
+            if not more:
+                raise RuntimeError(f"No audio from {cmd[0]}")
+            buf += more
+            try:
+                rate, _, _, off = _wav_header(buf)
+                buf = buf[off:]
+            except ValueError:
+                if len(buf) > 4096:
+                    raise
+        while True:
+            more = proc.stdout.read(PCM_CHUNK * 2)
+            if not more:
+                break
+            buf += more
+            n = len(buf) - len(buf) % 2
+            if n:
+                yield np.frombuffer(buf[:n], dtype=np.int16), rate
+                buf = buf[n:]
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+# ---------- Reading sessions ----------
+class SessionStore:
+    """Per-document reading state in one JSON file, keyed by absolute path. A record is
+    only returned while the document's size and mtime match what was saved."""
+
+    def __init__(self, path: str = SESSION_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._data: Dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
 
-def apply_pron(text: str, rules: List[Tuple[str, str]]) -> str:
-    out = text
-    for term, rep in rules:
-        out = re.sub(rf"\b{re.escape(term)}\b", rep, out, flags=re.IGNORECASE)
-    return out
+    def get(self, doc: str) -> Optional[dict]:
+        rec = self._data.get(os.path.abspath(doc))
+        try:
+            st = os.stat(doc)
+        except OSError:
+            return None
+        if not rec or rec.get("size") != st.st_size or rec.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        return rec
+
+    def put(self, doc: str, **state) -> None:
+        try:
+            st = os.stat(doc)
+        except OSError:
+            return
+        with self._lock:
+            self._data[os.path.abspath(doc)] = dict(state, size=st.st_size, mtime_ns=st.st_mtime_ns,
+                                                    saved_at=time.time())
+            if len(self._data) > SESSION_MAX:  # forget the least recently read documents
+                for k in sorted(self._data, key=lambda k: self._data[k].get("saved_at", 0))[:-SESSION_MAX]:
+                    del self._data[k]
+            try:
+                _write_atomic(self.path, [json.dumps(self._data, ensure_ascii=False, indent=1).encode("utf-8")])
+            except OSError as e:
+                log(f"Could not save session: {e}")
+
+# ---------- Temp WAV spool ----------
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        return True  # os.kill() would terminate it; orphans are aged out instead
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists, owned by someone else
+    return True
+
+class WavSpool:
+    """Every temporary WAV this process writes lives in one directory of its own.
+    Holders (the audio queue, the player) acquire/release paths; a file is deleted
+    when its last holder lets go. Paths outside the spool (cache files) are ignored,
+    so callers never need to know where a WAV came from."""
+
+    PREFIX = "tts_free-spool-"
+    GRACE = 60.0              # unreferenced files younger than this are still on their way to a holder
+    ORPHAN_AGE = 24 * 3600.0  # Windows: spools of other runs older than this are abandoned
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = SPOOL_MB << 20) -> None:
+        # path: attach to another process's spool (pool workers write into the parent's)
+        self.owner = path is None
+        if self.owner:
+            os.makedirs(SPOOL_BASE, exist_ok=True)
+            self.sweep_orphans(SPOOL_BASE)
+            path = tempfile.mkdtemp(prefix=f"{self.PREFIX}{os.getpid()}-", dir=SPOOL_BASE)
+        self.dir = path
+        self.max_bytes = max_bytes
+        self._refs: Dict[str, int] = {}
+        self._retry: set = set()  # deletes that failed (file still open on Windows)
+        self._lock = threading.Lock()
+        log(f"WAV spool: {self.dir}")
+
+    @classmethod
+    def sweep_orphans(cls, base: str) -> None:
+        """Remove the spools of runs that crashed or were killed."""
+        try:
+            names = os.listdir(base)
+        except OSError:
+            return
+        now = time.time()
+        for fn in names:
+            pid = fn[len(cls.PREFIX):].split("-", 1)[0]
+            if not fn.startswith(cls.PREFIX) or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            path = os.path.join(base, fn)
+            try:
+                stale = not _pid_alive(int(pid)) or (os.name == "nt" and now - os.path.getmtime(path) > cls.ORPHAN_AGE)
+            except OSError:
+                continue
+            if stale:
+                log(f"Removing orphaned spool {path}")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def owns(self, path: str) -> bool:
+        return os.path.abspath(path).startswith(self.dir + os.sep)
+
+    def new_path(self, suffix: str = ".wav") -> str:
+        if self.owner:
+            self._enforce()
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=self.dir)
+        os.close(fd)
+        return path
+
+    def subdir(self, prefix: str) -> str:
+        """A directory inside the spool, for engines that pick their own file names."""
+        return tempfile.mkdtemp(prefix=prefix, dir=self.dir)
+
+    def acquire(self, path: str) -> None:
+        if self.owns(path):
+            with self._lock:
+                self._refs[path] = self._refs.get(path, 0) + 1
+
+    def release(self, path: str) -> None:
+        if not self.owns(path):
+            return
+        with self._lock:
+            n = self._refs.pop(path, 0) - 1
+            if n > 0:
+                self._refs[path] = n
+                return
+        self._unlink(path)
+
+    def discard(self, path: str) -> None:
+        """Delete a spool file nobody holds (a dropped prefetch result, a warm-up clip)."""
+        if self.owns(path):
+            with self._lock:
+                if path in self._refs:
+                    return
+            self._unlink(path)
+
+    def _unlink(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # already moved into the cache
+        except OSError:
+            with self._lock:
+                self._retry.add(path)
+
+    def _enforce(self) -> None:
+        """Retry failed deletes; over quota, drop the oldest unreferenced files."""
+        with self._lock:
+            retry, self._retry = self._retry, set()
+        for p in retry:
+            self._unlink(p)
+        files: List[Tuple[float, int, str]] = []
+        for dirpath, _, names in os.walk(self.dir):
+            for fn in names:
+                p = os.path.join(dirpath, fn)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, p))
+        size = sum(sz for _, sz, _ in files)
+        if size <= self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            idle = [f for f in sorted(files) if f[2] not in self._refs and now - f[0] > self.GRACE]
+        for _, sz, p in idle:
+            if size <= self.max_bytes:
+                break
+            self._unlink(p)
+            size -= sz
+        log(f"Spool over quota, trimmed to {size} bytes")
+
+    def close(self) -> None:
+        if self.owner:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+_SPOOL: Optional[WavSpool] = None
+_SPOOL_LOCK = threading.Lock()
+
+def spool() -> WavSpool:
+    """This process's WAV spool, created (and orphans swept) on first use."""
+    global _SPOOL
+    with _SPOOL_LOCK:
+        if _SPOOL is None:
+            _SPOOL = WavSpool()
+            atexit.register(_SPOOL.close)
+        return _SPOOL
+
+def attach_spool(path: str) -> None:
+    """Pool workers: write into the parent's spool, which the parent cleans up."""
+    global _SPOOL
+    with _SPOOL_LOCK:
+        _SPOOL = WavSpool(path)
 
 # ---------- Backends ----------
 class _BaseTTS:
-    def synth_to_wav(self, text: str) -> str: raise NotImplementedError
+    # Every synth method takes speed (1.0 = natural pace). Engines with a rate control use
+    # it; the others time-stretch their audio (_stretch_wav / time_stretch).
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str: raise NotImplementedError
     def name(self) -> str: return "Unknown"
+    def cache_params(self) -> dict: return {}  # engine settings that change the audio
+    def close(self) -> None: pass
+
+    def warm_up(self) -> None:
+        """Throwaway inference: loads lazy state and primes ONNX/torch kernels."""
+        spool().discard(self.synth_to_wav("Hello."))
 
-# Coqui (VCTK vits) — female UK speakers include p240 (well-regarded)
-COQUI_OK = False
+    def synth_to_pcm(self, text: str, speed: float = 1.0) -> Pcm:
+        """Whole sentence as in-memory audio. Backends override this to skip the temp WAV."""
+        path = self.synth_to_wav(text, speed)
+        try:
+            return read_wav_pcm(path)
+        finally:
+            spool().discard(path)
+
+    def iter_pcm(self, text: str, speed: float = 1.0) -> Iterator[Pcm]:
+        """Audio chunks as soon as the engine produces them (default: one chunk)."""
+        yield self.synth_to_pcm(text, speed)
+
+    batch_size = 1    # sentences that share one synth_batch forward pass (1 = no real batching)
+    max_parallel = 1  # synth calls that really run side by side (the rest wait on a lock)
+
+    def synth_batch(self, texts: List[str], speed: float = 1.0) -> List[Pcm]:
+        """Audio for several sentences, in order. Backends with batched inference override this."""
+        return [self.synth_to_pcm(t, speed) for t in texts]
+
+    def _stretch_wav(self, path: str, speed: float) -> str:
+        """For engines without a rate control: the WAV at path, time-stretched in place."""
+        if abs(speed - 1.0) < 1e-3:
+            return path
+        pcm, rate = read_wav_pcm(path)
+        return write_wav_pcm(path, time_stretch(pcm, rate, speed), rate)
+
+# Coqui (VCTK vits) — female UK speakers include p240 (well-regarded).
+# Only probe for the package here: importing TTS.api pulls in torch, which costs
+# seconds and hundreds of MB, so it happens on first use (or in the background).
+COQUI_OK = sys.version_info < (3, 12) and importlib.util.find_spec("TTS") is not None
 TTS = None
-try:
-    if sys.version_info < (3, 12):
-        from TTS.api import TTS as _TTS  # type: ignore
-        TTS = _TTS
-        COQUI_OK = True
-except Exception:
-    COQUI_OK = False
+_TTS_LOCK = threading.Lock()
+
+def load_coqui():
+    """Import Coqui TTS (and torch) once; safe to call from any thread."""
+    global TTS, COQUI_OK
+    with _TTS_LOCK:
+        if TTS is None and COQUI_OK:
+            t0 = time.perf_counter()
+            try:
+                from TTS.api import TTS as _TTS  # type: ignore
+                TTS = _TTS
+            except Exception as e:
+                COQUI_OK = False
+                log(f"Coqui import failed: {e}")
+            log(f"Coqui import took {(time.perf_counter() - t0) * 1000:.0f} ms")
+    if TTS is None:
+        raise RuntimeError("Coqui not available (Python >=3.12 or import error).")
+    return TTS
+
+def _coqui_model_files() -> Tuple[str, str]:
+    if not COQUI_OK:
+        raise RuntimeError("Coqui not available (Python >=3.12 or import error).")
+    model_dir = resource_path("models", "vctk_vits")
+    model_pth = os.path.join(model_dir, "model_file.pth")
+    cfg_json = os.path.join(model_dir, "config.json")
+    if not (os.path.isfile(model_pth) and os.path.isfile(cfg_json)):
+        raise RuntimeError("Coqui model files not found in ./models/vctk_vits")
+    return model_pth, cfg_json
+
+def partition_torch_threads(workers: int) -> None:
+    """Give this process its share of the cores, so N model copies don't oversubscribe."""
+    n = max(1, (os.cpu_count() or 1) // max(1, workers))
+    os.environ["OMP_NUM_THREADS"] = str(n)
+    try:
+        import torch  # type: ignore
+        torch.set_num_threads(n)
+        torch.set_num_interop_threads(1)
+    except Exception as e:  # interop threads can only be set before torch's first parallel op
+        log(f"torch thread setup: {e}")
+    log(f"torch intra-op threads for pid {os.getpid()}: {n}")
 
 class CoquiBackend(_BaseTTS):
     def __init__(self, speaker: str = "p240") -> None:
-        if not COQUI_OK or TTS is None:
-            raise RuntimeError("Coqui not available (Python >=3.12 or import error).")
-        model_dir = resource_path("models", "vctk_vits")
-        model_pth = os.path.join(model_dir, "model_file.pth")
-        cfg_json = os.path.join(model_dir, "config.json")
-        if not (os.path.isfile(model_pth) and os.path.isfile(cfg_json)):
-            raise RuntimeError("Coqui model files not found in ./models/vctk_vits")
-        log(f"Loading Coqui model from {model_dir}")
-        self.tts = TTS(model_path=model_pth, config_path=cfg_json,
+        model_pth, cfg_json = _coqui_model_files()
+        log(f"Loading Coqui model from {os.path.dirname(model_pth)}")
+        self.tts = load_coqui()(model_path=model_pth, config_path=cfg_json,
                        progress_bar=False, gpu=False)
+        self.model_pth = model_pth
         self.speaker = speaker
-
-    def synth_to_wav(self, text: str) -> str:
+        self._lock = threading.Lock()  # one model instance: serialize prefetch threads
+        # VITS scales its predicted durations by length_scale: speed is 1 / length_scale
+        self._length_scale = getattr(self.tts.synthesizer.tts_model, "length_scale", None)
+
+    def _pace(self, speed: float) -> bool:
+        """Set the model's pace for the next inference (under self._lock); False if the
+        model has no length_scale, so the audio has to be time-stretched instead."""
+        if self._length_scale is None:
+            return abs(speed - 1.0) < 1e-3
+        self.tts.synthesizer.tts_model.length_scale = self._length_scale / speed
+        return True
+
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str:
+        text = (text or "").strip()
+        if not text:
+            raise ValueError("Empty text")
+        path = spool().new_path()
+        try:
+            with self._lock:
+                native = self._pace(speed)
+                self.tts.tts_to_file(text=text, speaker=self.speaker, file_path=path)
+            if not native:
+                self._stretch_wav(path, speed)
+        except BaseException:
+            spool().discard(path)
+            raise
+        return path
+
+    def synth_to_pcm(self, text: str, speed: float = 1.0) -> Pcm:
         text = (text or "").strip()
         if not text:
             raise ValueError("Empty text")
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        tmp.close()
-        self.tts.tts_to_file(text=text, speaker=self.speaker, file_path=tmp.name)
-        return tmp.name
+        with self._lock:
+            native = self._pace(speed)
+            wav = self.tts.tts(text=text, speaker=self.speaker)
+        rate = self.tts.synthesizer.output_sample_rate
+        return (to_int16(wav) if native else time_stretch(to_int16(wav), rate, speed)), rate
+
+    def iter_pcm(self, text: str, speed: float = 1.0) -> Iterator[Pcm]:
+        # Coqui splits long input into sentences anyway; hand each one over as it is done
+        for seg in self.tts.synthesizer.split_into_sentences((text or "").strip()) or [text]:
+            if seg.strip():
+                yield self.synth_to_pcm(seg, speed)
+
+    batch_size = BATCH_SIZE
+
+    def synth_batch(self, texts: List[str], speed: float = 1.0) -> List[Pcm]:
+        if self.batch_size < 2 or len(texts) < 2 or self._length_scale is None:
+            return super().synth_batch(texts, speed)
+        try:
+            return self._vits_batch(texts, speed)
+        except Exception as e:  # a model without batched inference (x_lengths/y_mask)
+            log(f"Coqui batched inference failed, one sentence at a time: {e!r}")
+            return super().synth_batch(texts, speed)
+
+    def _vits_batch(self, texts: List[str], speed: float = 1.0) -> List[Pcm]:
+        """Padded batches straight through the VITS model, skipping the per-call
+        synthesizer overhead. x_lengths masks the padding; each sentence's audio is
+        its share of y_mask frames times the hop length."""
+        import torch  # type: ignore
+        syn = self.tts.synthesizer
+        model, rate = syn.tts_model, syn.output_sample_rate
+        hop = model.config.audio.hop_length
+        sid = model.speaker_manager.name_to_id[self.speaker]
+        ids = []
+        for t in texts:
+            if not (t or "").strip():
+                raise ValueError("Empty text")
+            ids.append(model.tokenizer.text_to_ids(t.strip()))
+        out: List[Optional[Pcm]] = [None] * len(texts)
+        order = sorted(range(len(texts)), key=lambda j: len(ids[j]))  # similar lengths: less padding
+        for k in range(0, len(order), self.batch_size):
+            part = order[k:k + self.batch_size]
+            lens = [len(ids[j]) for j in part]
+            x = torch.zeros(len(part), max(lens), dtype=torch.long)
+            for r, j in enumerate(part):
+                x[r, :lens[r]] = torch.tensor(ids[j], dtype=torch.long)
+            aux = {"x_lengths": torch.tensor(lens, dtype=torch.long),
+                   "speaker_ids": torch.full((len(part),), sid, dtype=torch.long),
+                   "d_vectors": None, "language_ids": None}
+            with self._lock, torch.no_grad():
+                self._pace(speed)
+                res = model.inference(x, aux_input=aux)
+            wav = res["model_outputs"][:, 0].cpu().numpy()
+            frames = res["y_mask"].sum(dim=(1, 2)).long().tolist()
+            for r, j in enumerate(part):
+                out[j] = (to_int16(wav[r, :frames[r] * hop]), rate)
+        return out
 
     def name(self) -> str: return f"Coqui TTS (VCTK, {self.speaker})"
+    def cache_params(self) -> dict: return {"model": self.model_pth, "speaker": self.speaker}
+
+# Coqui process pool: each worker process loads its own VITS model once and pulls
+# sentences from the executor's call queue, so throughput scales with cores.
+_COQUI_WORKER: dict = {}
+
+def _coqui_worker_init(speaker: str, workers: int, spool_dir: str) -> None:
+    attach_spool(spool_dir)
+    partition_torch_threads(workers)
+    _COQUI_WORKER["backend"] = CoquiBackend(speaker)
+
+def _coqui_worker_wav(text: str, speed: float = 1.0) -> str:
+    return _COQUI_WORKER["backend"].synth_to_wav(text, speed)
+
+def _coqui_worker_pcm(text: str, speed: float = 1.0) -> Pcm:
+    return _COQUI_WORKER["backend"].synth_to_pcm(text, speed)
+
+def _coqui_worker_batch(texts: List[str], speed: float = 1.0) -> List[Pcm]:
+    return _COQUI_WORKER["backend"].synth_batch(texts, speed)
+
+class CoquiPoolBackend(_BaseTTS):
+    def __init__(self, speaker: str = "p240", workers: int = COQUI_WORKERS) -> None:
+        self.model_pth, _ = _coqui_model_files()
+        self.speaker = speaker
+        self.workers = self.max_parallel = workers
+        # spawn, not fork: the GUI process is multi-threaded by the time this runs
+        self.pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_coqui_worker_init, initargs=(speaker, workers, spool().dir))
+        log(f"Coqui pool: {workers} worker processes")
+
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str:
+        return self.pool.submit(_coqui_worker_wav, text, speed).result()
+
+    def synth_to_pcm(self, text: str, speed: float = 1.0) -> Pcm:
+        return self.pool.submit(_coqui_worker_pcm, text, speed).result()
+
+    batch_size = BATCH_SIZE
+
+    def synth_batch(self, texts: List[str], speed: float = 1.0) -> List[Pcm]:
+        # one padded batch per worker process, run side by side
+        n = max(1, self.batch_size)
+        futs = [self.pool.submit(_coqui_worker_batch, texts[k:k + n], speed)
+                for k in range(0, len(texts), n)]
+        return [pcm for fut in futs for pcm in fut.result()]
+
+    # same voice as CoquiBackend, so both share cache entries
+    def name(self) -> str: return f"Coqui TTS (VCTK, {self.speaker})"
+    def cache_params(self) -> dict: return {"model": self.model_pth, "speaker": self.speaker}
+
+    def warm_up(self) -> None:
+        # one job per worker, submitted together so each process gets one
+        for fut in [self.pool.submit(_coqui_worker_wav, "Hello.") for _ in range(self.workers)]:
+            spool().discard(fut.result())
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# Piper worker: one long-lived `piper --json-input` process per backend, so the
+# .onnx voice is loaded once instead of once per sentence.
+class PiperWorker:
+    TIMEOUT = 120.0  # seconds to wait for one sentence before declaring the worker hung
+
+    def __init__(self, exe: str, model: str, cfg: Optional[str], length_scale: float = 1.0) -> None:
+        self.exe, self.model, self.cfg = exe, model, cfg
+        self.natural = length_scale       # the voice config's own; no flag needed
+        self.length_scale = length_scale  # of the running process; a request at another pace restarts it
+        self.out_dir = spool().subdir("piper-")
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.served = 0  # sentences answered; 0 after a failure means this piper can't run as a worker
+        atexit.register(self.close)
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self) -> None:
+        # Piper prints the path of every WAV it writes to --output_dir on stdout,
+        # one line per JSON request; that line is our completion signal.
+        cmd = [self.exe, "-m", self.model, "--json-input", "--output_dir", self.out_dir]
+        if self.cfg:
+            cmd.extend(["-c", self.cfg])
+        if self.length_scale != self.natural:
+            cmd.extend(["--length_scale", f"{self.length_scale:.4g}"])
+        log(f"Piper worker start: {cmd}")
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]") -> None:
+        for raw in proc.stdout:
+            lines.put(raw.decode("utf-8", "replace").strip())
+        lines.put(None)  # EOF: process exited
+
+    def _request(self, text: str) -> str:
+        if not self.alive():
+            self._start()
+        self._proc.stdin.write((json.dumps({"text": text}) + "\n").encode("utf-8"))
+        self._proc.stdin.flush()
+        while True:
+            line = self._lines.get(timeout=self.TIMEOUT)
+            if line is None:
+                raise RuntimeError("Piper worker exited")
+            if line.endswith(".wav") and os.path.isfile(line):
+                self.served += 1
+                return line
+
+    def synth_to_wav(self, text: str, length_scale: Optional[float] = None) -> str:
+        length_scale = self.natural if length_scale is None else length_scale
+        with self._lock:
+            if length_scale != self.length_scale:
+                self._kill()  # --length_scale is fixed per process: restart at the new pace
+                self.length_scale = length_scale
+            try:
+                return self._request(text)
+            except (OSError, RuntimeError, queue.Empty) as e:
+                if not self.served:
+                    raise  # never answered once: a restart would fail the same way
+                # crashed or hung: restart once and retry this sentence
+                log(f"Piper worker restart after: {e!r}")
+                self._kill()
+                return self._request(text)
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.terminate()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
 
 # Piper (MIT) — use en_GB-cori-high by default (female UK)
 class PiperBackend(_BaseTTS):
@@ -168,22 +1304,80 @@ class PiperBackend(_BaseTTS):
         self.model = model
         self.cfg = (cfg or None)
         self.model_basename = model_basename
-
-    def synth_to_wav(self, text: str) -> str:
+        self.sample_rate = 22050  # Piper's default; the voice config says otherwise
+        self.length_scale = 1.0   # the voice's own pace; --length_scale replaces it, so speed divides it
+        if self.cfg:
+            try:
+                with open(self.cfg, "r", encoding="utf-8") as f:
+                    vcfg = json.load(f)
+                self.length_scale = float(vcfg.get("inference", {}).get("length_scale", 1.0))
+                self.sample_rate = int(vcfg["audio"]["sample_rate"])
+            except Exception as e:
+                log(f"Piper config without sample rate ({e}); assuming {self.sample_rate}")
+        self._worker: "PiperWorker | bool | None" = None  # started on first synth; False: one-shot only
+
+    def _scale(self, speed: float) -> float:
+        return self.length_scale if abs(speed - 1.0) < 1e-3 else self.length_scale / speed
+
+    def _args(self, speed: float) -> List[str]:
+        args = ["-c", self.cfg] if self.cfg else []
+        if abs(speed - 1.0) >= 1e-3:
+            args.extend(["--length_scale", f"{self._scale(speed):.4g}"])  # phoneme durations
+        return args
+
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str:
         text = (text or "").strip()
         if not text:
             raise ValueError("Empty text")
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav"); tmp.close()
-        cmd = [self.exe, "-m", self.model, "--output_file", tmp.name]
-        if self.cfg:
-            cmd.extend(["-c", self.cfg])
+        if self._worker is False:
+            return self._synth_oneshot(text, speed)
+        if self._worker is None:
+            self._worker = PiperWorker(self.exe, self.model, self.cfg, self.length_scale)
+        worker = self._worker
+        try:
+            return worker.synth_to_wav(text, self._scale(speed))
+        except Exception as e:
+            if not worker.served:
+                # Older Piper builds lack --json-input: one process per sentence from now on
+                log(f"Piper worker unusable ({e}); using one-shot piper from now on")
+                worker.close()
+                self._worker = False
+            else:
+                log(f"Piper worker failed ({e}); using one-shot piper")
+            return self._synth_oneshot(text, speed)
+
+    def _synth_oneshot(self, text: str, speed: float = 1.0) -> str:
+        path = spool().new_path()
+        cmd = [self.exe, "-m", self.model, "--output_file", path] + self._args(speed)
         log(f"Piper synth: {cmd}")
-        subprocess.run(cmd, input=text.encode("utf-8"), check=True)
-        return tmp.name
+        try:
+            subprocess.run(cmd, input=text.encode("utf-8"), check=True)
+        except BaseException:
+            spool().discard(path)
+            raise
+        return path
+
+    def iter_pcm(self, text: str, speed: float = 1.0) -> Iterator[Pcm]:
+        # --output_raw streams samples while later phonemes are still being inferred.
+        # This runs a one-shot process, so it pays the model load the worker avoids.
+        text = (text or "").strip()
+        if not text:
+            raise ValueError("Empty text")
+        cmd = [self.exe, "-m", self.model, "--output_raw"] + self._args(speed)
+        log(f"Piper stream: {cmd}")
+        yield from _iter_stdout_pcm(cmd, text.encode("utf-8"), self.sample_rate)
+
+    def close(self) -> None:
+        if self._worker:
+            self._worker.close()
+            self._worker = None
 
     def name(self) -> str:
         return f"Piper ({self.model_basename})"
 
+    def cache_params(self) -> dict:
+        return {"model": self.model, "cfg": self.cfg}
+
 
 # eSpeak NG (kept as optional last resort)
 class EspeakBackend(_BaseTTS):
@@ -192,27 +1386,228 @@ class EspeakBackend(_BaseTTS):
         if not exe:
             raise RuntimeError("eSpeak NG not found in PATH")
         self.exe, self.voice, self.rate, self.pitch = exe, voice, rate, pitch
+        self.max_parallel = os.cpu_count() or 1  # one process per call
+
+    def _wpm(self, speed: float) -> str:
+        return str(max(80, int(round(self.rate * speed))))  # eSpeak's rate is words per minute
 
-    def synth_to_wav(self, text: str) -> str:
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str:
         text = (text or "").strip()
         if not text:
             raise ValueError("Empty text")
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        tmp.close()
-        cmd = [self.exe, "-v", self.voice, "-s", str(self.rate),
-               "-p", str(self.pitch), "-w", tmp.name, text]
+        path = spool().new_path()
+        cmd = [self.exe, "-v", self.voice, "-s", self._wpm(speed),
+               "-p", str(self.pitch), "-w", path, text]
         log(f"eSpeak synth: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True)
-        return tmp.name
+        try:
+            subprocess.run(cmd, check=True)
+        except BaseException:
+            spool().discard(path)
+            raise
+        return path
+
+    def _stdout_cmd(self, text: str, speed: float) -> List[str]:
+        text = (text or "").strip()
+        if not text:
+            raise ValueError("Empty text")
+        return [self.exe, "-v", self.voice, "-s", self._wpm(speed),
+                "-p", str(self.pitch), "--stdout", text]
+
+    def synth_to_pcm(self, text: str, speed: float = 1.0) -> Pcm:
+        out = subprocess.run(self._stdout_cmd(text, speed), check=True, stdout=subprocess.PIPE).stdout
+        return pcm_from_wav_bytes(out)
+
+    def iter_pcm(self, text: str, speed: float = 1.0) -> Iterator[Pcm]:
+        yield from _iter_stdout_pcm(self._stdout_cmd(text, speed), None, None)
 
     def name(self) -> str: return f"eSpeak NG ({self.voice})"
+    def cache_params(self) -> dict: return {"voice": self.voice, "rate": self.rate, "pitch": self.pitch}
+
+# ---------- Sentence packing ----------
+# The reader steps sentence by sentence, but the engines do not want sentence-sized
+# calls: a heading or "Yes." pays the full per-call overhead for a syllable, and a
+# page-long sentence makes Coqui slow and memory hungry. Runs of sentences are packed
+# into synthesis units; a unit's audio is cut back into one clip per sentence.
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:\u2013\u2014])\s+|\s+(?=(?:and|but|or|because|which|while|although|though|so|yet)\b)")
+
+def split_clauses(text: str, limit: int = PACK_MAX) -> List[str]:
+    """text in pieces of at most limit chars, cut at clause boundaries (or, failing
+    that, at the last space before the limit)."""
+    if len(text) <= limit:
+        return [text]
+    parts, cur = [], ""
+    pos = 0
+    for m in list(_CLAUSE_BREAK.finditer(text)) + [None]:
+        piece = text[pos:m.start() if m else len(text)]
+        pos = m.end() if m else len(text)
+        if cur and len(cur) + 1 + len(piece) > limit:
+            parts.append(cur)
+            cur = ""
+        cur = f"{cur} {piece}" if cur else piece
+        while len(cur) > limit:  # one clause longer than the limit
+            cut = cur.rfind(" ", 0, limit)
+            cut = cut if cut > 0 else limit
+            parts.append(cur[:cut])
+            cur = cur[cut:].lstrip()
+    if cur:
+        parts.append(cur)
+    return parts
+
+def pack_sentences(texts: List[str]) -> List[Tuple[List[int], List[str]]]:
+    """Group consecutive sentences into synthesis units: (sentence indices, engine texts).
+    Several indices share one engine text (tiny fragments packed up to PACK_TARGET);
+    one index may have several (a sentence over PACK_MAX, split at clauses)."""
+    units: List[Tuple[List[int], List[str]]] = []
+    for j, t in enumerate(texts):
+        if len(t) > PACK_MAX:
+            units.append(([j], split_clauses(t)))
+            continue
+        if units and len(units[-1][1]) == 1:
+            idxs, (cur,) = units[-1]
+            last = texts[idxs[-1]]
+            if (len(last) < PACK_MIN or len(t) < PACK_MIN) and len(cur) + 1 + len(t) <= PACK_TARGET:
+                # a heading has no full stop; give it one so it is not run into the next sentence
+                units[-1] = (idxs + [j], [f"{cur}{'' if cur[-1:] in '.!?;:' else '.'} {t}"])
+                continue
+        units.append(([j], [t]))
+    return units
+
+def _quiet_point(pcm: "np.ndarray", lo: int, hi: int, frame: int) -> int:
+    """Middle of the lowest-energy frame in pcm[lo:hi]."""
+    seg = pcm[lo:hi].astype(np.float32)
+    n = len(seg) // frame
+    if n < 2:
+        return (lo + hi) // 2
+    energy = (seg[:n * frame].reshape(n, frame) ** 2).mean(axis=1)
+    return lo + int(energy.argmin()) * frame + frame // 2
+
+def sentence_cuts(pcm: "np.ndarray", rate: int, lengths: List[int]) -> List[int]:
+    """Sample offsets where a packed unit's sentences meet: each estimated from its
+    share of the characters, then moved to the quietest 10 ms nearby (the pause)."""
+    n, total, frame = len(pcm), max(1, sum(lengths)), max(1, rate // 100)
+    cuts, acc, prev = [], 0, 0
+    for w in lengths[:-1]:
+        acc += w
+        est = n * acc // total
+        reach = max(2 * frame, min(rate * 3 // 10, n * w // total // 2))
+        lo, hi = max(prev + frame, est - reach), min(n - frame, est + reach)
+        prev = _quiet_point(pcm, lo, hi, frame) if hi > lo else max(prev, min(est, n))
+        cuts.append(prev)
+    return cuts
+
+def synth_units(backend: _BaseTTS, texts: List[str], speed: float = 1.0) -> List[Pcm]:
+    """One clip per sentence of texts, synthesized as packed units in one synth_batch."""
+    _need_numpy()
+    units = pack_sentences(texts)
+    pcms = backend.synth_batch([p for _, parts in units for p in parts], speed)
+    out: List[Optional[Pcm]] = [None] * len(texts)
+    k = 0
+    for idxs, parts in units:
+        got, k = pcms[k:k + len(parts)], k + len(parts)
+        rate = got[0][1]
+        if len(idxs) == 1:
+            out[idxs[0]] = (np.concatenate([pcm for pcm, _ in got]) if len(got) > 1 else got[0][0], rate)
+            if len(got) > 1:
+                log(f"Sentence split at clauses: {[round(len(pcm) / rate, 2) for pcm, _ in got]} s")
+            continue
+        pcm = got[0][0]
+        cuts = sentence_cuts(pcm, rate, [len(texts[j]) + 1 for j in idxs])
+        log(f"Packed {len(idxs)} sentences, boundaries at {[round(c / rate, 2) for c in cuts]} s")
+        for j, a, b in zip(idxs, [0] + cuts, cuts + [len(pcm)]):
+            out[j] = (pcm[a:b], rate)
+    return out
+
+# ---------- Synthesis cache ----------
+class SynthCache:
+    """Content-addressed WAV store: sha256(backend, params, text) -> <root>/ab/abcd….wav.
+    Hits refresh the file mtime, which doubles as the LRU clock for eviction."""
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # bytes on disk, scanned lazily
+        self._lock = threading.Lock()
+
+    def key(self, backend: _BaseTTS, text: str, speed: float = 1.0) -> str:
+        params = backend.cache_params()
+        if abs(speed - 1.0) >= 1e-3:  # natural-pace keys stay as they were
+            params = dict(params, speed=round(speed, 3))
+        blob = json.dumps([backend.name(), params, text], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".wav")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            os.utime(path)  # LRU touch
+        except OSError:
+            return None
+        log(f"Cache hit {key[:12]}")
+        return path
+
+    def put(self, key: str, wav_path: str) -> str:
+        """Move a freshly synthesized WAV into the cache and return its cached path."""
+        dst = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            part = f"{dst}.{os.getpid()}.{threading.get_ident()}.part"
+            shutil.move(wav_path, part)
+            os.replace(part, dst)  # atomic publish; concurrent writers of one key are harmless
+        except OSError as e:
+            log(f"Cache write failed: {e}")
+            return wav_path if os.path.isfile(wav_path) else dst
+        with self._lock:
+            if self._size is None:
+                self._size = sum(sz for _, sz, _ in self._entries())
+            else:
+                self._size += os.path.getsize(dst)
+            if self._size > self.max_bytes:
+                self._evict()
+        return dst
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        out: List[Tuple[float, int, str]] = []
+        for dirpath, _, files in os.walk(self.root):
+            for fn in files:
+                if fn.endswith(".wav"):
+                    p = os.path.join(dirpath, fn)
+                    try:
+                        st = os.stat(p)
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def _evict(self) -> None:
+        # drop least recently used files until we are 10% under the cap
+        entries = sorted(self._entries())
+        size = sum(sz for _, sz, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, sz, p in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(p)
+                size -= sz
+            except OSError:
+                pass  # e.g. still open for playback on Windows
+        log(f"Cache evicted down to {size} bytes")
+        self._size = size
+
+def default_cache() -> Optional[SynthCache]:
+    return SynthCache(CACHE_DIR, CACHE_MB * 1024 * 1024) if CACHE_MB > 0 else None
 
 # Backend chooser: prefer Coqui -> Piper; eSpeak only if allowed
-def choose_backend(allow_espeak: bool, coqui_speaker: str, piper_model: str) -> _BaseTTS:
+def choose_backend(allow_espeak: bool, coqui_speaker: str, piper_model: str,
+                   coqui_workers: int = COQUI_WORKERS) -> _BaseTTS:
     errors: List[str] = []
     # Try Coqui (female UK p240)
     if COQUI_OK:
         try:
+            if coqui_workers > 1:
+                return CoquiPoolBackend(coqui_speaker, coqui_workers)
             return CoquiBackend(coqui_speaker)
         except Exception as e:
             errors.append(f"Coqui: {e}")
@@ -233,6 +1628,478 @@ def choose_backend(allow_espeak: bool, coqui_speaker: str, piper_model: str) ->
     # If we’re here, nothing worked
     raise RuntimeError("No speech backend available:\n" + "\n".join(errors))
 
+# ---------- Synthesis scheduler ----------
+class SynthScheduler:
+    """Every synthesis job of the GUI goes through here. At most `workers` jobs run at
+    once; queued jobs start lowest priority first (0 = the sentence being read, so it
+    goes ahead of any prefetch), and bump() cancels everything queued so far except
+    jobs submitted with keep=True (the stream feeding the speaker). Each future carries
+    the generation it was submitted in (fut.generation), so results of jobs that were
+    already running at a bump can be recognised and dropped."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.generation = 0
+        self._heap: list = []  # (priority, seq, future, fn, args)
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._busy = 0
+        self._closed = False
+
+    def submit(self, fn, *args, priority: int = 0, keep: bool = False) -> Future:
+        fut: Future = Future()
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            fut.generation = self.generation
+            fut.keep = keep
+            heapq.heappush(self._heap, (priority, next(self._seq), fut, fn, args))
+            # start another thread only while the queue outnumbers the idle ones
+            if len(self._threads) < self.workers and len(self._heap) > len(self._threads) - self._busy:
+                t = threading.Thread(target=self._run, name=f"synth-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+            self._cv.notify()
+        return fut
+
+    def resize(self, workers: int) -> None:
+        """Change the concurrency limit; extra threads exit once they finish their job."""
+        with self._cv:
+            self.workers = max(1, workers)
+            self._cv.notify_all()
+
+    def promote(self, fut: Future, priority: int) -> None:
+        """Move a queued job up; its old heap entry is skipped once the job has started."""
+        with self._cv:
+            for prio, _, f, fn, args in self._heap:
+                if f is fut:
+                    if priority < prio:
+                        heapq.heappush(self._heap, (priority, next(self._seq), f, fn, args))
+                    return
+
+    def bump(self, everything: bool = False) -> int:
+        """Start a new generation: every job queued so far is cancelled (running ones finish).
+        keep=True jobs move to the new generation instead, unless everything is set."""
+        with self._cv:
+            self.generation += 1
+            kept = [] if everything else [e for e in self._heap if e[2].keep]
+            stale = [e for e in self._heap if everything or not e[2].keep]
+            for entry in kept:
+                entry[2].generation = self.generation
+            heapq.heapify(kept)
+            self._heap = kept
+        # cancel() runs done-callbacks, which may take the caller's locks: not under _cv
+        return sum(entry[2].cancel() for entry in stale)
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while True:
+                    while not self._heap and not self._closed:
+                        self._cv.wait()
+                    if self._closed:
+                        return
+                    if len(self._threads) > self.workers:  # resize() shrank the pool
+                        self._threads.remove(threading.current_thread())
+                        self._cv.notify()  # hand the queued job to a thread that stays
+                        return
+                    _, _, fut, fn, args = heapq.heappop(self._heap)
+                    # cancelled jobs are dropped; a promoted job's second entry finds it started
+                    if not (fut.running() or fut.done()) and fut.set_running_or_notify_cancel():
+                        self._busy += 1
+                        break
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as e:
+                fut.set_exception(e)
+            finally:
+                with self._cv:
+                    self._busy -= 1
+
+    def shutdown(self) -> None:
+        with self._cv:
+            self._closed = True
+            stale, self._heap = self._heap, []
+            self._cv.notify_all()
+        for entry in stale:
+            entry[2].cancel()
+
+# ---------- Streaming playback ----------
+class PcmRingBuffer(QtCore.QIODevice):
+    """FIFO of int16 PCM: a synthesis thread push()es chunks, QAudioOutput pulls them."""
+    started = QtCore.pyqtSignal(int)       # first chunk arrived; carries the sample rate
+    firstAudio = QtCore.pyqtSignal(float)  # seconds from creation to first samples handed to the device
+    failed = QtCore.pyqtSignal(str)        # the producer gave up; carries the error message
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+        self._rate: Optional[int] = None
+        self._eof = False
+        self._closed = False
+        self._heard = False
+        self.t0 = time.perf_counter()
+
+    def push(self, data: bytes, rate: int) -> bool:
+        """Append samples; returns False once playback was stopped (producer should quit)."""
+        with self._lock:
+            if self._closed:
+                return False
+            self._buf += data
+            first = self._rate is None
+            self._rate = self._rate or rate
+        if first:
+            self.started.emit(rate)
+        return True
+
+    def finish(self) -> None:
+        with self._lock:
+            self._eof = True
+
+    def shut(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._buf.clear()
+
+    def drained(self) -> bool:
+        with self._lock:
+            return self._eof and not self._buf
+
+    def isSequential(self) -> bool:
+        return True
+
+    def bytesAvailable(self) -> int:
+        with self._lock:
+            return len(self._buf) + super().bytesAvailable()
+
+    def readData(self, maxlen: int) -> bytes:
+        with self._lock:
+            out = bytes(self._buf[:maxlen])
+            del self._buf[:len(out)]
+        if out and not self._heard:
+            self._heard = True
+            self.firstAudio.emit(time.perf_counter() - self.t0)
+        return out
+
+    def writeData(self, data: bytes) -> int:
+        return -1  # read-only from Qt's side; producers use push()
+
+class StreamPlayer(QtCore.QObject):
+    """Plays one sentence from a PcmRingBuffer while it is still being synthesized."""
+    firstAudio = QtCore.pyqtSignal(float)
+    finished = QtCore.pyqtSignal()
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._out: Optional[QAudioOutput] = None
+        self._ring: Optional[PcmRingBuffer] = None
+
+    def open(self) -> PcmRingBuffer:
+        """Stop whatever is playing and return a fresh buffer; output starts on its first chunk."""
+        self.stop()
+        ring = PcmRingBuffer(self)
+        ring.started.connect(partial(self._start_output, ring))
+        ring.firstAudio.connect(self.firstAudio)
+        ring.failed.connect(partial(self._fail, ring))
+        self._ring = ring
+        return ring
+
+    def playing(self) -> bool:
+        return self._ring is not None
+
+    def _start_output(self, ring: PcmRingBuffer, rate: int) -> None:
+        if ring is not self._ring:
+            return  # stopped before the first chunk arrived
+        fmt = QAudioFormat()
+        fmt.setSampleRate(rate)
+        fmt.setChannelCount(1)
+        fmt.setSampleSize(16)
+        fmt.setCodec("audio/pcm")
+        fmt.setByteOrder(QAudioFormat.LittleEndian)
+        fmt.setSampleType(QAudioFormat.SignedInt)
+        self._out = QAudioOutput(fmt, self)
+        self._out.stateChanged.connect(self._on_state)
+        ring.open(QtCore.QIODevice.ReadOnly)
+        self._out.start(ring)  # pull mode: Qt calls ring.readData as the device needs samples
+
+    def _on_state(self, state) -> None:
+        ring, out = self._ring, self._out
+        if state != QAudio.IdleState or ring is None or out is None or not ring.drained():
+            return  # plain underrun: synthesis is behind, keep waiting
+        # the device still holds up to one buffer of audio; let it play out
+        tail_ms = int(out.bufferSize() * 1000 / max(1, out.format().sampleRate() * 2))
+        QtCore.QTimer.singleShot(tail_ms, partial(self._end, ring))
+
+    def _fail(self, ring: PcmRingBuffer, msg: str) -> None:
+        if ring is not self._ring:
+            return  # already skipped
+        self.error.emit(msg)
+        if self._out is None:  # nothing was heard: end now (otherwise what arrived plays out)
+            self.stop()
+            self.finished.emit()
+
+    def _end(self, ring: PcmRingBuffer) -> None:
+        if ring is self._ring:
+            self.stop()
+            self.finished.emit()
+
+    def stop(self) -> None:
+        if self._out is not None:
+            self._out.stop()
+            self._out.deleteLater()
+            self._out = None
+        if self._ring is not None:
+            self._ring.shut()
+            self._ring.deleteLater()
+            self._ring = None
+
+class GaplessPlayer(StreamPlayer):
+    """Plays consecutive sentences from one continuous output stream: each one's PCM is
+    appended to the same PcmRingBuffer (after a pause of silence), so there is no media
+    reload between them. reached(tag) fires when a sentence's first sample is played."""
+    reached = QtCore.pyqtSignal(int)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._marks: "deque[Tuple[int, int]]" = deque()  # (start frame, tag) not yet reached
+        self._frames = self._rate = 0
+        self.last: Optional[int] = None  # tag of the last sentence enqueued
+
+    def enqueue(self, tag: int, pcm: "np.ndarray", rate: int, pause_ms: int = 0) -> None:
+        if self._ring is None:
+            self.open()
+            self._frames, self._rate = 0, rate
+        elif pause_ms > 0:
+            self._push(np.zeros(self._rate * pause_ms // 1000, dtype=np.int16))
+        if rate != self._rate:  # voice changed mid-stream: the device keeps its first rate
+            n = int(round(len(pcm) * self._rate / rate))
+            pcm = np.interp(np.linspace(0, len(pcm) - 1, n), np.arange(len(pcm)), to_int16(pcm))
+            pcm = pcm.round().astype(np.int16)  # still on the int16 scale, not [-1, 1]
+        self._marks.append((self._frames, tag))
+        self.last = tag
+        self._push(to_int16(pcm))
+
+    def _push(self, pcm: "np.ndarray") -> None:
+        self._ring.push(pcm.tobytes(), self._rate)
+        self._frames += len(pcm)
+
+    def pending(self) -> int:
+        """Sentences enqueued but not started yet."""
+        return len(self._marks)
+
+    def _start_output(self, ring: PcmRingBuffer, rate: int) -> None:
+        super()._start_output(ring, rate)
+        if self._out is not None and ring is self._ring:
+            self._out.setNotifyInterval(40)
+            self._out.notify.connect(self._poll)
+
+    def _poll(self) -> None:
+        if self._out is None:
+            return
+        heard = self._out.processedUSecs() * self._rate // 1_000_000
+        while self._marks and self._marks[0][0] <= heard:
+            self.reached.emit(self._marks.popleft()[1])
+
+    def stop(self) -> None:
+        super().stop()
+        self._marks.clear()
+        self.last = None
+
+def build_backend(prefer: str, allow_espeak: bool, coqui_workers: int = COQUI_WORKERS) -> _BaseTTS:
+    """Backend for a voice label (COQUI_VOICE or a PIPER_VOICES key), with fallbacks."""
+    def try_piper_with_fallback(first_choice: str) -> _BaseTTS:
+        # Try selected Piper voice, then the other ones, then Coqui, then eSpeak (if allowed)
+        piper_order = [first_choice] + [b for b in PIPER_VOICES.values() if b != first_choice]
+        for basename in piper_order:
+            try:
+                return PiperBackend(basename)
+            except Exception as e:
+                log(f"Piper ({basename}) failed: {e}")
+        # fall back to Coqui -> eSpeak (optional)
+        return choose_backend(allow_espeak, coqui_speaker="p240", piper_model=first_choice,
+                              coqui_workers=coqui_workers)
+
+    if prefer.startswith("Coqui"):
+        # Prefer Coqui, but if not available (e.g., Python 3.12), fall back to Piper (Cori) -> eSpeak
+        return choose_backend(allow_espeak, coqui_speaker="p240", piper_model="en_GB-cori-high",
+                              coqui_workers=coqui_workers)
+    # A Piper voice was selected; map to its basename and try that first
+    basename = PIPER_VOICES.get(prefer, "en_GB-cori-high")
+    return try_piper_with_fallback(basename)
+
+# ---------- Headless export ----------
+# Each pool process builds its own backend once (initializer) and then synthesizes
+# runs of sentences to PCM (one batch per job); the parent stitches results back together in order.
+_EXPORT: dict = {}
+
+def _export_init(voice: str, allow_espeak: bool, rules: PronRules, jobs: int, spool_dir: str,
+                 speed: float = 1.0) -> None:
+    attach_spool(spool_dir)
+    if COQUI_OK and voice.startswith("Coqui"):
+        partition_torch_threads(jobs)
+    # the export pool already is the process pool: one in-process model per worker
+    _EXPORT["backend"] = build_backend(voice, allow_espeak, coqui_workers=1)
+    _EXPORT["rules"] = rules
+    _EXPORT["speed"] = speed
+    _EXPORT["cache"] = default_cache()
+    atexit.register(_EXPORT["backend"].close)
+
+def _export_synth(texts: List[str]) -> List[Pcm]:
+    """Cache hits are read back; the misses go to the backend as one batch."""
+    backend, cache, speed = _EXPORT["backend"], _EXPORT["cache"], _EXPORT["speed"]
+    spoken = [apply_pron(t, _EXPORT["rules"]) for t in texts]
+    if cache is None:
+        return synth_units(backend, spoken, speed)
+    keys = [cache.key(backend, s, speed) for s in spoken]
+    out: List[Optional[Pcm]] = []
+    for key in keys:
+        hit = cache.get(key)
+        out.append(read_wav_pcm(hit) if hit else None)
+    miss = [j for j, pcm in enumerate(out) if pcm is None]
+    for j, (pcm, rate) in zip(miss, synth_units(backend, [spoken[j] for j in miss], speed) if miss else []):
+        tmp = spool().new_path()
+        cache.put(keys[j], write_wav_pcm(tmp, pcm, rate))
+        spool().discard(tmp)  # only left behind if the cache write failed
+        out[j] = (pcm, rate)
+    return out
+
+class _AudioSink:
+    """Writes int16 mono PCM to .wav directly, or through ffmpeg for .ogg/.mp3/etc."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.rate = 0
+        self._wav: Optional[wave.Wave_write] = None
+        self._proc: Optional[subprocess.Popen] = None
+
+    def _open(self, rate: int) -> None:
+        self.rate = rate
+        if self.path.lower().endswith(".wav"):
+            self._wav = wave.open(self.path, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(rate)
+            return
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg not found in PATH (needed for non-WAV output)")
+        cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+               "-f", "s16le", "-ar", str(rate), "-ac", "1", "-i", "-", self.path]
+        log(f"Export encoder: {cmd}")
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, pcm: "np.ndarray", rate: int) -> None:
+        if not self.rate:
+            self._open(rate)
+        elif rate != self.rate:
+            raise RuntimeError(f"Sample rate changed mid-document ({self.rate} -> {rate})")
+        data = to_int16(pcm).tobytes()
+        if self._wav is not None:
+            self._wav.writeframes(data)
+        else:
+            self._proc.stdin.write(data)
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+        if self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed with exit code {self._proc.returncode}")
+
+def export_document(src: str, dst: str, voice: str = COQUI_VOICE, allow_espeak: bool = False,
+                    rules: Optional[PronRules] = None, jobs: Optional[int] = None,
+                    gap_ms: int = PAUSE_MS, batch: int = BATCH_SIZE, speed: float = 1.0) -> dict:
+    """Synthesize a whole document into one audio file; returns throughput stats."""
+    _need_numpy()
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    batch = max(1, batch)
+    t0 = time.perf_counter()
+    sink = _AudioSink(dst)
+    samples = n = written = 0
+
+    def emit(fut: Future) -> None:
+        nonlocal samples, written
+        for pcm, rate in fut.result():
+            if written and gap_ms > 0:
+                gap = np.zeros(rate * gap_ms // 1000, dtype=np.int16)
+                sink.write(gap, rate)
+                samples += len(gap)
+            sink.write(pcm, rate)
+            samples += len(pcm)
+            written += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_export_init,
+                                 initargs=(voice, allow_espeak, rules or PronRules([]), jobs,
+                                           spool().dir, speed)) as pool:
+            # Sentences are read lazily and only a few batches per worker are in flight;
+            # results are written strictly in document order as soon as the oldest one is done.
+            inflight: "deque[Future]" = deque()
+            run: List[str] = []
+            for text in iter_sentences(src):
+                run.append(text)
+                n += 1
+                if len(run) < batch:
+                    continue
+                inflight.append(pool.submit(_export_synth, run))
+                run = []
+                if len(inflight) >= jobs * max(2, 4 // batch):
+                    emit(inflight.popleft())
+                    log(f"Exported {written}/{n}+")
+            if run:
+                inflight.append(pool.submit(_export_synth, run))
+            while inflight:
+                emit(inflight.popleft())
+    finally:
+        sink.close()
+    if not n:
+        raise RuntimeError("No sentences found")
+    wall = time.perf_counter() - t0
+    audio_sec = samples / sink.rate if sink.rate else 0.0
+    return {"sentences": n, "jobs": jobs, "batch": batch, "wall_sec": wall, "audio_sec": audio_sec,
+            "sentences_per_sec": n / wall if wall else 0.0,
+            "realtime_factor": wall / audio_sec if audio_sec else 0.0}
+
+def export_main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(prog="app.py export",
+                                 description="Convert a .txt/.docx document into one audio file.")
+    ap.add_argument("input", help=".txt or .docx document")
+    ap.add_argument("output", help="output audio (.wav, or any ffmpeg format such as .ogg/.mp3)")
+    ap.add_argument("--voice", default="coqui",
+                    help="'coqui' or a Piper voice: " + ", ".join(PIPER_VOICES.values()))
+    ap.add_argument("--pron", help="pronunciation CSV (term,replacement)")
+    ap.add_argument("--jobs", type=int, default=0, help="worker processes (default: all cores)")
+    ap.add_argument("--gap-ms", type=int, default=PAUSE_MS, help="silence between sentences")
+    ap.add_argument("--batch", type=int, default=BATCH_SIZE,
+                    help="sentences per job; Coqui runs them as one padded batch")
+    ap.add_argument("--speed", type=float, default=SPEED, help="speaking speed, 0.5-3 (1 = natural)")
+    ap.add_argument("--allow-espeak", action="store_true", help="allow the eSpeak fallback")
+    args = ap.parse_args(argv)
+    if not 0.5 <= args.speed <= 3.0:
+        ap.error("--speed must be between 0.5 and 3")
+
+    if args.voice.lower().startswith("coqui"):
+        voice = COQUI_VOICE
+    else:
+        voice = next((k for k, v in PIPER_VOICES.items() if args.voice in (k, v)), None)
+        if voice is None:
+            ap.error(f"unknown voice {args.voice!r}")
+    try:
+        rules = load_pron_csv(args.pron) if args.pron else PronRules([])
+        st = export_document(args.input, args.output, voice, args.allow_espeak, rules,
+                             args.jobs or None, args.gap_ms, args.batch, args.speed)
+    except Exception as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {args.output}: {st['sentences']} sentences, {st['audio_sec']:.1f} s audio "
+          f"in {st['wall_sec']:.1f} s with {st['jobs']} workers — "
+          f"{st['sentences_per_sec']:.2f} sentences/s, realtime factor {st['realtime_factor']:.3f}")
+    return 0
+
 # ---------- GUI ----------
 LICENSE_TEXT = """TTS Free — Licensing & Attribution
 -----------------------------------
@@ -246,25 +2113,165 @@ Speech Engines:
   • eSpeak NG — GPLv3 (optional, off by default)
 """
 
+class MetricsPanel(QtWidgets.QDialog):
+    """Live per-stage latency table (Help ▸ Pipeline metrics), with Prometheus/JSON export."""
+
+    def __init__(self, parent: QtWidgets.QWidget) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Pipeline metrics")
+        self.resize(720, 360)
+        self.table = QtWidgets.QPlainTextEdit(readOnly=True)
+        self.table.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        btn_prom = QtWidgets.QPushButton("Save Prometheus…")
+        btn_json = QtWidgets.QPushButton("Save JSON lines…")
+        btn_reset = QtWidgets.QPushButton("Reset")
+        btn_prom.clicked.connect(lambda: self._save("Prometheus text (*.prom *.txt)", METRICS.prometheus))
+        btn_json.clicked.connect(lambda: self._save("JSON lines (*.jsonl)", METRICS.jsonl))
+        btn_reset.clicked.connect(lambda: (METRICS.reset(), self.refresh()))
+        row = QtWidgets.QHBoxLayout()
+        row.addWidget(btn_prom)
+        row.addWidget(btn_json)
+        row.addStretch(1)
+        row.addWidget(btn_reset)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(row)
+        self._timer = QtCore.QTimer(self, interval=1000)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, ev) -> None:
+        self.refresh()
+        self._timer.start()
+        super().showEvent(ev)
+
+    def hideEvent(self, ev) -> None:
+        self._timer.stop()
+        super().hideEvent(ev)
+
+    def refresh(self) -> None:
+        rows = [f"{'stage':<20} {'count':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'total s':>9}"]
+        for r in METRICS.summary():
+            rows.append(f"{r['stage']:<20} {r['count']:>7} {r['mean'] * 1e3:>9.1f} {r['p50'] * 1e3:>9.1f} "
+                        f"{r['p95'] * 1e3:>9.1f} {r['max'] * 1e3:>9.1f} {r['sum']:>9.2f}")
+        for g in METRICS.gauges():
+            labels = ", ".join(f"{k}={v}" for k, v in g.items() if k not in ("gauge", "value"))
+            rows.append(f"{g['gauge']:<20} {g['value']:>7.3f}  {labels}")
+        self.table.setPlainText("\n".join(rows) if len(rows) > 1 else "No samples yet.")
+
+    def _save(self, filt: str, render) -> None:
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save metrics", "", filt)
+        if fn:
+            try:
+                _write_atomic(fn, [render().encode("utf-8")])
+            except OSError as e:
+                QtWidgets.QMessageBox.warning(self, "Save metrics", str(e))
+
 @dataclass
 class AudioQueue:
-    items: List[str]
+    items: "SentenceIndex | LazySentences"
     idx: int = 0
-    cur_wav: Optional[str] = None
-    next_wav: Optional[str] = None
+    lookahead: int = LOOKAHEAD
+    behind: int = KEEP_BEHIND
+    wavs: Dict[int, str] = field(default_factory=dict)          # sentence index -> WAV path (held in the spool)
+    pending: Dict[int, Future] = field(default_factory=dict)    # sentence index -> prefetch job
+
+    @property
+    def cur_wav(self) -> Optional[str]:
+        return self.wavs.get(self.idx)
+
+    def window(self) -> range:
+        """Indices that should be synthesized ahead of the current sentence."""
+        stop = self.idx + 1
+        while stop < self.idx + 1 + self.lookahead and self.items.has(stop):
+            stop += 1
+        return range(self.idx + 1, stop)
+
+    def keep(self) -> range:
+        """Indices whose audio is worth holding: a few played ones, the current one and the window."""
+        return range(max(0, self.idx - self.behind), self.window().stop)
+
+    def seek(self, i: int) -> bool:
+        if i < 0 or not self.items.has(i):
+            return False
+        self.idx = i
+        return True
+
+    def find(self, needle: str) -> Optional[int]:
+        """Next sentence after the current one that contains needle."""
+        return self.items.find(needle, self.idx + 1) if needle else None
+
+    def text_or_end(self, i: int) -> str:
+        return self.items[i] if self.items.has(i) else "(end)"
+
+    def buffered_ahead(self) -> int:
+        """Number of consecutive sentences after idx that are ready to play."""
+        n = 0
+        for i in self.window():
+            if i not in self.wavs:
+                break
+            n += 1
+        return n
+
+    def put(self, i: int, path: str) -> None:
+        spool().acquire(path)
+        old, self.wavs[i] = self.wavs.get(i), path
+        if old is not None:
+            spool().release(old)
+
+    def drop(self, i: int) -> None:
+        spool().release(self.wavs.pop(i))
+
+    def release_all(self) -> None:
+        for i in list(self.wavs):
+            self.drop(i)
+
+    def cancel_all(self) -> None:
+        for fut in list(self.pending.values()):  # a cancel callback may clear entries
+            fut.cancel()
+        self.pending.clear()
 
 class Main(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
-        self.rules: List[Tuple[str, str]] = []
-        self.queue = AudioQueue([])
+        self.rules = PronRules([])
+        self.queue = AudioQueue(LazySentences())
+        self.cache = default_cache()
+        self.sessions = SessionStore()
+        self._doc: Optional[str] = None    # document loaded in the queue
+        self._voice: Optional[str] = None  # voice label its backend was built for
+        # all synthesis runs here; enough threads to keep every Coqui worker process busy
+        self.sched = SynthScheduler(max(PREFETCH_WORKERS, COQUI_WORKERS))
+        # guards queue.idx/wavs/pending across prefetch threads; reentrant because
+        # Future.cancel() runs _on_prefetched synchronously while it is held
+        self._qlock = threading.RLock()
         self.player = QMediaPlayer(self)
         self.player.setVolume(100)
+        self.stream = StreamPlayer(self)  # used when a sentence is not synthesized yet
+        self.gapless = GaplessPlayer(self)  # Auto mode: ready sentences back to back
+        self._playing: Optional[str] = None  # WAV loaded in self.player
+        self._play_t0 = 0.0
 
         # Playback flags
         self._end_consumed = False
         self._manual_advance = False
         self.started = False
+        # On-demand synthesis: sentence played as soon as its audio lands, and how often
+        # prefetch lost the race (steps that had to wait, total/longest wait)
+        self._wait_idx: Optional[int] = None
+        self._wait_t0 = 0.0
+        self._steps = self._misses = self._waits = 0
+        self._wait_total = self._wait_max = 0.0
+        # Adaptive prefetch: smoothed realtime factor (synthesis time / audio time) of
+        # the current backend, audio per sentence, the reader's pace (seconds per step,
+        # shorter than the audio when stepping manually), and the lookahead depth and
+        # worker count derived from them
+        self._rtf_lock = threading.Lock()
+        self._rtf: Optional[float] = None
+        self._sent_s: Optional[float] = None
+        self._step_s: Optional[float] = None
+        self._step_at = 0.0
+        self._lookahead = LOOKAHEAD
+        self._speed = SPEED  # read by synthesis threads; each job keeps the value it started with
 
         # UI
         self.setWindowTitle("TTS Free (Desktop)")
@@ -272,16 +2279,24 @@ class Main(QtWidgets.QMainWindow):
 
         self.btn_load = QtWidgets.QPushButton("Load .txt/.docx")
         self.btn_pron = QtWidgets.QPushButton("Pronunciation CSV")
+        self.btn_prev = QtWidgets.QPushButton("◀ Back"); self.btn_prev.setEnabled(False)
         self.btn_next = QtWidgets.QPushButton("▶ Next"); self.btn_next.setEnabled(False)
 
         # Voice choices
         self.cbo_engine = QtWidgets.QComboBox()
-        items = ["Coqui (VCTK p240 — UK female)"] + list(PIPER_VOICES.keys())
+        items = [COQUI_VOICE] + list(PIPER_VOICES.keys())
         self.cbo_engine.addItems(items)
         self.cbo_engine.setCurrentIndex(0)
 
         self.chk_allow_espeak = QtWidgets.QCheckBox("Allow eSpeak fallback (robotic)")
         self.chk_allow_espeak.setChecked(False)
+        self.chk_stream = QtWidgets.QCheckBox("Stream")
+        self.chk_stream.setToolTip("Start playing sentences that are not synthesized yet while they are being synthesized")
+        self.chk_stream.setChecked(True)
+        self.spn_speed = QtWidgets.QDoubleSpinBox(suffix="×", decimals=2, singleStep=0.25,
+                                                  toolTip="Speaking speed (pitch is kept)")
+        self.spn_speed.setRange(0.5, 3.0)
+        self.spn_speed.setValue(SPEED)
 
         top = QtWidgets.QHBoxLayout()
         top.addWidget(self.btn_load)
@@ -289,13 +2304,23 @@ class Main(QtWidgets.QMainWindow):
         top.addStretch(1)
         top.addWidget(QtWidgets.QLabel("Voice:"))
         top.addWidget(self.cbo_engine)
+        top.addWidget(self.spn_speed)
         top.addWidget(self.chk_allow_espeak)
+        top.addWidget(self.btn_prev)
         top.addWidget(self.btn_next)
         self.txt_cur = QtWidgets.QPlainTextEdit(readOnly=True)
         self.txt_nxt = QtWidgets.QPlainTextEdit(readOnly=True)
         self.status = QtWidgets.QLabel("Ready")
+        self.lbl_buffer = QtWidgets.QLabel("")
         self.chk_auto = QtWidgets.QCheckBox("Auto")
         self.chk_auto.setChecked(False)
+        self.spn_pause = QtWidgets.QSpinBox(suffix=" ms", singleStep=50, toolTip="Pause between sentences in Auto mode")
+        self.spn_pause.setRange(0, 3000)
+        self.spn_pause.setValue(PAUSE_MS)
+        top.insertWidget(top.indexOf(self.btn_next), self.chk_auto)
+        if GAPLESS:
+            top.insertWidget(top.indexOf(self.btn_next), self.spn_pause)
+        top.insertWidget(top.indexOf(self.btn_next), self.chk_stream)
 
         layout = QtWidgets.QVBoxLayout()
         layout.addLayout(top)
@@ -303,7 +2328,11 @@ class Main(QtWidgets.QMainWindow):
         layout.addWidget(self.txt_cur)
         layout.addWidget(QtWidgets.QLabel("<b>Next:</b>"))
         layout.addWidget(self.txt_nxt)
-        layout.addWidget(self.status)
+        bottom = QtWidgets.QHBoxLayout()
+        bottom.addWidget(self.status)
+        bottom.addStretch(1)
+        bottom.addWidget(self.lbl_buffer)
+        layout.addLayout(bottom)
 
         cw = QtWidgets.QWidget(); cw.setLayout(layout)
         self.setCentralWidget(cw)
@@ -311,27 +2340,167 @@ class Main(QtWidgets.QMainWindow):
         # Menu
         about_act = QtWidgets.QAction("About", self)
         about_act.triggered.connect(lambda: QtWidgets.QMessageBox.about(self, "About / Licenses", LICENSE_TEXT))
-        menu = self.menuBar().addMenu("Help"); menu.addAction(about_act)
+        nav = self.menuBar().addMenu("Navigate")
+        for label, keys, slot in (("Back", ["Left", "Backspace"], self.go_back),
+                                  ("Next", ["Right"], self.next_or_play),
+                                  ("Go to sentence…", ["Ctrl+G"], self.go_to_prompt),
+                                  ("Find…", ["Ctrl+F"], self.find_prompt),
+                                  ("Find next", ["F3"], self.find_next)):
+            act = QtWidgets.QAction(label, self)
+            act.setShortcuts([QtGui.QKeySequence(k) for k in keys])
+            act.triggered.connect(slot)
+            nav.addAction(act)
+        self._find_text = ""
+        self._find_seq = 0
+        self._find_queue: Optional[AudioQueue] = None
+        metrics_act = QtWidgets.QAction("Pipeline metrics…", self)
+        metrics_act.setShortcut(QtGui.QKeySequence("Ctrl+M"))
+        metrics_act.triggered.connect(self._show_metrics)
+        self._metrics_panel: Optional[MetricsPanel] = None
+        menu = self.menuBar().addMenu("Help"); menu.addAction(metrics_act); menu.addAction(about_act)
 
         # Signals
         self.btn_load.clicked.connect(self._choose_file)
         self.btn_pron.clicked.connect(self._choose_pron)
         self.btn_next.clicked.connect(self.next_or_play)
+        self.btn_prev.clicked.connect(self.go_back)
         QtWidgets.QShortcut(QtGui.QKeySequence("Space"), self, activated=self.next_or_play)
 
         self.player.mediaStatusChanged.connect(self._on_media_status_changed)
-
-        # Backend is constructed lazily after the file is loaded
+        # session saves are debounced: at most one write per burst of Next presses
+        self._session_timer = QtCore.QTimer(self, singleShot=True, interval=1500)
+        self._session_timer.timeout.connect(self._save_session)
+        self.stream.finished.connect(self._on_clip_end)
+        self.stream.firstAudio.connect(self._on_first_audio)
+        self.stream.error.connect(self._ui_err)
+        self.gapless.firstAudio.connect(lambda sec: METRICS.observe("play_start", sec))
+        self.gapless.reached.connect(self._on_gapless_reached)
+
+        # Backend in use by the loaded document; the selected voice is built and
+        # warmed up in the background (see _warm_backend) and swapped in on load
         self._backend: Optional[_BaseTTS] = None
+        self._warmer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warmup")
+        self._warm: Optional[Future] = None
+        self._warm_key: Optional[Tuple[str, bool]] = None
+        self._loading: Optional[Future] = None  # warm-up a document load is waiting on; never dropped
+        self._wlock = threading.Lock()
+        self.cbo_engine.currentIndexChanged.connect(lambda _: self._warm_backend())
+        self.chk_allow_espeak.toggled.connect(lambda _: self._warm_backend())
+        # speed changes are debounced: typing "1.75" or holding an arrow resynthesizes once
+        self._speed_timer = QtCore.QTimer(self, singleShot=True, interval=500)
+        self._speed_timer.timeout.connect(lambda: self._set_speed(self.spn_speed.value()))
+        self.spn_speed.valueChanged.connect(lambda _: self._speed_timer.start())
+
+        if METRICS_PROM:  # for a node_exporter textfile collector
+            self._prom_timer = QtCore.QTimer(self, interval=15000)
+            self._prom_timer.timeout.connect(self._write_prometheus)
+            self._prom_timer.start()
+
+    def _show_metrics(self) -> None:
+        if self._metrics_panel is None:
+            self._metrics_panel = MetricsPanel(self)
+        self._metrics_panel.show()
+        self._metrics_panel.raise_()
+
+    def _write_prometheus(self) -> None:
+        try:
+            _write_atomic(METRICS_PROM, [METRICS.prometheus().encode("utf-8")])
+        except OSError as e:
+            log(f"Could not write metrics: {e}")
 
     # -------- file handling --------
     def _choose_file(self) -> None:
         fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open", "", "Text/Docx (*.txt *.docx)")
         if not fn: return
+        self._save_session()  # remember where we left the previous document
+        self.gapless.stop()  # it would go on feeding sentences from the new document
+        self.stream.stop()
         self.status.setText("Loading...")
         self.btn_next.setEnabled(False)
         self.started = False
-        threading.Thread(target=self._prepare, args=(fn,), daemon=True).start()
+        start = self._restore_session(fn)
+        threading.Thread(target=self._prepare, args=(fn, start), daemon=True).start()
+
+    # -------- reading sessions --------
+    def _restore_session(self, path: str) -> int:
+        """Re-apply the saved voice and pronunciation file; returns the saved sentence index."""
+        rec = self.sessions.get(path)
+        if not rec:
+            return 0
+        i = self.cbo_engine.findText(rec.get("voice") or "")
+        if i >= 0:
+            self.cbo_engine.setCurrentIndex(i)  # starts warming that voice right away
+        pron = rec.get("pron_path")
+        if pron and rec.get("pron_hash") != self.rules.digest and os.path.isfile(pron):
+            try:
+                rules = load_pron_csv(pron)
+                if rules.digest == rec.get("pron_hash"):
+                    self.rules = rules
+                else:
+                    log(f"Pronunciation file changed since last session: {pron}")
+            except Exception as e:
+                log(f"Session pronunciation file: {e}")
+        log(f"Resuming {path} at sentence {rec.get('idx', 0)}")
+        return int(rec.get("idx", 0))
+
+    def _save_session(self) -> None:
+        if not self._doc or not self.queue.items:
+            return
+        self.sessions.put(self._doc, idx=self.queue.idx, voice=self._voice,
+                          backend=self._backend.name() if self._backend else None,
+                          pron_hash=self.rules.digest, pron_path=self.rules.source)
+
+    # -------- backend warm-up --------
+    def _warm_backend(self, claim: bool = False) -> Future:
+        """Build (once per voice selection) and warm up the selected backend off the UI thread.
+        claim: a document load will adopt the result, so a later voice change must not close it."""
+        key = (self.cbo_engine.currentText(), self.chk_allow_espeak.isChecked())
+        with self._wlock:
+            fut = self._warm
+            if fut is not None and self._warm_key == key and not (fut.done() and fut.exception()):
+                if claim:
+                    self._loading = fut
+                return fut
+            self._warm_key = key
+            self._warm = self._warmer.submit(self._build_backend, key)
+            self._warm.add_done_callback(self._on_warm_done)
+            if claim:
+                self._loading = self._warm
+        if fut is not None:
+            fut.add_done_callback(self._drop_backend)
+        return self._warm
+
+    def _build_backend(self, key: Tuple[str, bool]) -> Optional[_BaseTTS]:
+        if key != self._warm_key:
+            return None  # the user picked another voice while this one was queued
+        t0 = time.perf_counter()
+        with METRICS.span("backend_build", voice=key[0]):
+            backend = build_backend(*key)
+        try:
+            with METRICS.span("warm_up", backend=backend.name()):
+                backend.warm_up()
+        except Exception as e:
+            log(f"Warm-up of {backend.name()} failed: {e}")
+        log(f"{backend.name()} ready in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return backend
+
+    def _on_warm_done(self, fut: Future) -> None:
+        if fut.cancelled() or fut.exception() or fut.result() is None or fut is not self._warm:
+            return
+        if not self.queue.items:
+            QtCore.QMetaObject.invokeMethod(self, "_ui_err", QtCore.Qt.QueuedConnection,
+                                            QtCore.Q_ARG(str, f"Voice ready: {fut.result().name()}"))
+
+    def _drop_backend(self, fut: Future) -> None:
+        # a superseded warm-up: close its backend unless the loaded document uses it
+        # or a load is about to adopt it
+        if fut.cancelled() or fut.exception():
+            return
+        backend = fut.result()
+        with self._wlock:
+            if backend is None or backend is self._backend or fut is self._loading:
+                return
+        backend.close()
 
     def _choose_pron(self) -> None:
         fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pronunciation CSV", "", "CSV (*.csv)")
@@ -342,54 +2511,78 @@ class Main(QtWidgets.QMainWindow):
         except Exception as e:
             self.status.setText(f"CSV error: {e}")
 
-    def _prepare(self, path: str) -> None:
+    def _prepare(self, path: str, start: int = 0) -> None:
+        t0 = time.perf_counter()
         try:
-            sents = split_sentences(read_text(path))
-            if not sents:
+            # only the first block is indexed now; the rest is indexed in the background
+            with METRICS.span("index_open"):
+                sents = SentenceIndex(path, head=["(start)"])
+            if not sents.has(1):
+                sents.close()
                 raise RuntimeError("No sentences found")
-            sents.insert(0, "(start)")
-            self.queue = AudioQueue(items=sents)
-
-            # Choose backend now (based on UI selection)
-            prefer = self.cbo_engine.currentText()
-            allow_espeak = self.chk_allow_espeak.isChecked()
-            
-            def try_piper_with_fallback(first_choice: str) -> _BaseTTS:
-                # Try selected Piper voice, then the other ones, then Coqui, then eSpeak (if allowed)
-                piper_order = [first_choice] + [b for b in PIPER_VOICES.values() if b != first_choice]
-                for basename in piper_order:
+            threading.Thread(target=sents.complete, daemon=True).start()
+            with self._qlock:
+                self.queue.cancel_all()
+                self.queue.release_all()
+                self.sched.bump(everything=True)  # anything still queued belongs to the previous document
+                old, self.queue = self.queue, AudioQueue(items=sents, lookahead=self._lookahead)
+                if start > 0 and sents.has(start):
+                    self.queue.idx = start
+                self._doc = path
+            old.items.close()
+
+            # Use the warmed-up backend for the current selection (waits if still loading)
+            backend = None
+            with METRICS.span("backend_wait"):
+                while backend is None:  # None: the selection changed while that build was queued
+                    fut = self._warm_backend(claim=True)
+                    self._voice = self._warm_key[0]
                     try:
-                        return PiperBackend(basename)
-                    except Exception as e:
-                        log(f"Piper ({basename}) failed: {e}")
-                # fall back to Coqui -> eSpeak (optional)
-                return choose_backend(allow_espeak, coqui_speaker="p240", piper_model=first_choice)
-            
-            if prefer.startswith("Coqui"):
-                # Prefer Coqui, but if not available (e.g., Python 3.12), fall back to Piper (Cori) -> eSpeak
-                self._backend = choose_backend(allow_espeak, coqui_speaker="p240", piper_model="en_GB-cori-high")
-            else:
-                # A Piper voice was selected; map to its basename and try that first
-                basename = PIPER_VOICES.get(prefer, "en_GB-cori-high")
-                self._backend = try_piper_with_fallback(basename)
-
-            # Synthesize first two
-            self.queue.cur_wav = self._synth(self.queue.items[0])
-            if len(self.queue.items) > 1:
-                self.queue.next_wav = self._synth(self.queue.items[1])
+                        backend = fut.result()
+                    finally:
+                        if backend is None:
+                            with self._wlock:
+                                self._loading = None
+            with self._wlock:  # adopt before releasing the claim, so no drop can close it
+                old, self._backend, self._loading = self._backend, backend, None
+            if backend is not old:
+                if old is not None:
+                    old.close()  # stop the previous Piper worker, if any
+                self._retune(None)  # the old backend's speed says nothing about this one
+
+            # Synthesize the current item now (unless it can be streamed on demand);
+            # the sentences after it fill in the background
+            if not self.chk_stream.isChecked():
+                # through the scheduler, so it counts against the worker limit like every other job
+                fut = self.sched.submit(self._synth, self.queue.items[self.queue.idx], priority=0)
+                self.queue.put(self.queue.idx, fut.result())
+            self._fill_window(include_current=True)
 
         except Exception as e:
             QtCore.QMetaObject.invokeMethod(self, "_ui_err", QtCore.Qt.QueuedConnection,
                                             QtCore.Q_ARG(str, f"Load error: {e}"))
             return
+        METRICS.observe("prepare", time.perf_counter() - t0)
         QtCore.QMetaObject.invokeMethod(self, "_ui_ready", QtCore.Qt.QueuedConnection)
 
     @QtCore.pyqtSlot()
     def _ui_ready(self) -> None:
-        self.txt_cur.setPlainText(self.queue.items[0])
-        self.txt_nxt.setPlainText(self.queue.items[1] if len(self.queue.items) > 1 else "(end)")
-        self.status.setText(f"Backend: {self._backend.name() if self._backend else 'None'}")
+        idx = self.queue.idx
+        self.txt_cur.setPlainText(self.queue.items[idx])
+        self.txt_nxt.setPlainText(self.queue.text_or_end(idx + 1))
+        self.status.setText(f"Backend: {self._backend.name() if self._backend else 'None'}"
+                            + (f" · resumed at sentence {idx}" if idx else ""))
         self.btn_next.setEnabled(True)
+        self.btn_prev.setEnabled(True)
+        self._ui_buffer()
+
+    @QtCore.pyqtSlot()
+    def _ui_buffer(self) -> None:
+        q = self.queue
+        self.lbl_buffer.setText(f"Sentence {q.idx}/{max(0, len(q.items) - 1)}"
+                                f" · Buffered: {q.buffered_ahead()}/{len(q.window())} ahead"
+                                + (f" · RTF {self._rtf:.2f}, {self.sched.workers} worker(s)"
+                                   if self._rtf is not None else ""))
 
     @QtCore.pyqtSlot(str)
     def _ui_err(self, msg: str) -> None:
@@ -401,15 +2594,16 @@ class Main(QtWidgets.QMainWindow):
             return
         if not self.started:
             self.started = True
-            if self.queue.cur_wav:
-                self._play(self.queue.cur_wav)
+            self._play_current()
             return
 
-        if self.player.state() == QMediaPlayer.PlayingState:
+        if self.player.state() == QMediaPlayer.PlayingState or self.stream.playing() or self.gapless.playing():
             # manual single-step: stop current and advance once
             self._manual_advance = True
             self._end_consumed = True   # suppress auto handler for this clip
             self.player.stop()
+            self.stream.stop()
+            self.gapless.stop()
             self._advance()
             self._manual_advance = False
         else:
@@ -417,39 +2611,297 @@ class Main(QtWidgets.QMainWindow):
 
     def _play(self, wav_path: str) -> None:
         self._end_consumed = False  # arm for a single natural end
+        self.stream.stop()  # a sentence may still be streaming, e.g. from the previous document
+        if self._gapless_on():
+            self.player.stop()
+            if self._playing is not None:
+                spool().release(self._playing)
+                self._playing = None
+            self.gapless.stop()
+            self.gapless.enqueue(self.queue.idx, *read_wav_pcm(wav_path))
+            self._gapless_feed()
+            return
+        self.gapless.stop()
+        # the player holds its clip too, so evicting it from the queue mid-play is safe
+        spool().acquire(wav_path)
+        if self._playing is not None:
+            spool().release(self._playing)
+        self._playing = wav_path
         url = QUrl.fromLocalFile(os.path.abspath(wav_path))
+        self._play_t0 = time.perf_counter()  # play_start: until the player has buffered the clip
         self.player.setMedia(QMediaContent(url))
         self.player.play()
 
+    def _play_current(self) -> None:
+        stream = self.chk_stream.isChecked() and self._backend is not None
+        with self._qlock:
+            wav = self.queue.cur_wav
+            # already being synthesized: waiting for that job beats a second synthesis
+            stream = stream and self.queue.idx not in self.queue.pending
+            # set under the lock, so a result landing right now still finds it
+            self._wait_idx = None if wav or stream else self.queue.idx
+            self._wait_t0 = time.perf_counter()
+        self._steps += 1
+        if wav:
+            self._play(wav)
+        elif stream:
+            self._stream(self.queue.idx)
+        else:
+            # prefetch lost the race: schedule this sentence at top priority;
+            # _on_prefetched plays it the moment it is done
+            self._misses += 1
+            self.player.stop()
+            self.status.setText(f"Synthesizing sentence {self.queue.idx}…")
+            self._fill_window(include_current=True)
+
+    @QtCore.pyqtSlot(int)
+    def _play_waited(self, i: int) -> None:
+        with self._qlock:
+            if self._wait_idx != i or self.queue.idx != i or not self.queue.cur_wav:
+                return  # the reader moved on meanwhile
+            self._wait_idx = None
+            wav = self.queue.cur_wav
+        waited = time.perf_counter() - self._wait_t0
+        self._waits += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        METRICS.observe("wait_on_miss", waited)
+        log(f"Sentence {i} waited {waited * 1000:.0f} ms for synthesis; prefetch missed "
+            f"{self._misses}/{self._steps} steps, avg wait {self._wait_total / self._waits * 1000:.0f} ms, "
+            f"max {self._wait_max * 1000:.0f} ms")
+        self.status.setText(f"Backend: {self._backend.name() if self._backend else 'None'}"
+                            f" · waited {waited * 1000:.0f} ms (prefetch missed {self._misses}/{self._steps})")
+        self._play(wav)
+
+    def _stream(self, i: int) -> None:
+        """Play sentence i from the backend's chunk stream instead of waiting for a WAV."""
+        self._end_consumed = False
+        ring = self.stream.open()
+        # keep: a speed change must not strand the speaker with a ring nobody fills
+        fut = self.sched.submit(self._stream_worker, self._backend, self.queue.items[i], ring, self._speed,
+                                priority=0, keep=True)
+        fut.add_done_callback(partial(self._stream_cancelled, ring))
+
+    @staticmethod
+    def _stream_cancelled(ring: PcmRingBuffer, fut: Future) -> None:
+        if not fut.cancelled():
+            return
+        try:
+            ring.failed.emit("Synthesis cancelled")  # ends the stream player if it still waits on ring
+        except RuntimeError:
+            pass  # ring already deleted: playback was stopped before the cancel
+
+    def _stream_worker(self, backend: _BaseTTS, text: str, ring: PcmRingBuffer, speed: float) -> None:
+        spoken = apply_pron(text, self.rules)
+        chunks, rate = [], 0
+        try:
+            for pcm, rate in backend.iter_pcm(spoken, speed):
+                if not ring.push(pcm.tobytes(), rate):
+                    return  # user skipped ahead
+                chunks.append(pcm)
+        except Exception as e:
+            log(f"Streaming synth failed: {e}")
+            ring.failed.emit(f"Synthesis error: {e}")
+            return
+        finally:
+            ring.finish()
+        if self.cache is not None and chunks:
+            # keep the streamed audio so replays and prefetch hit the cache
+            tmp = spool().new_path()
+            self.cache.put(self.cache.key(backend, spoken, speed), write_wav_pcm(tmp, np.concatenate(chunks), rate))
+            spool().discard(tmp)
+
+    # -------- gapless auto mode --------
+    def _gapless_on(self) -> bool:
+        return GAPLESS and np is not None and self.chk_auto.isChecked()
+
+    @QtCore.pyqtSlot()
+    def _gapless_feed(self) -> None:
+        """Append the next sentence to the gapless stream once the last one queued has
+        started, so one sentence is always lined up behind the one being heard."""
+        if not self.gapless.playing() or self.gapless.pending() or not self._gapless_on():
+            return
+        with self._qlock:
+            nxt = self.gapless.last + 1
+            wav = self.queue.wavs.get(nxt)  # not ready: _on_prefetched calls back
+            pcm = read_wav_pcm(wav) if wav else None
+        if pcm is not None:
+            self.gapless.enqueue(nxt, *pcm, pause_ms=self.spn_pause.value())
+
+    def _on_gapless_reached(self, i: int) -> None:
+        if i != self.queue.idx:
+            self._steps += 1
+            self._note_pace()
+            self._step_to(i, play=False)  # its audio is already playing
+        self._gapless_feed()
+
+    def _on_first_audio(self, sec: float) -> None:
+        METRICS.observe("stream_first_audio", sec)
+        log(f"Time to first sound (streamed): {sec * 1000:.0f} ms")
+        self.status.setText(f"Backend: {self._backend.name() if self._backend else 'None'}"
+                            f" · first audio after {sec * 1000:.0f} ms")
+
     def _advance(self) -> None:
-        if self.queue.idx + 1 >= len(self.queue.items):
-            return  # end
-        self.queue.idx += 1
-        # rotate buffers
-        self.queue.cur_wav = self.queue.next_wav
-        self.queue.next_wav = None
+        self._note_pace()
+        self._step_to(self.queue.idx + 1)
+
+    def _note_pace(self) -> None:
+        now = time.perf_counter()
+        if self._step_at and now - self._step_at < 30:  # longer gaps are pauses, not pace
+            d = now - self._step_at
+            self._step_s = d if self._step_s is None else 0.3 * d + 0.7 * self._step_s
+        self._step_at = now
+
+    def _step_to(self, i: int, play: bool = True) -> None:
+        with self._qlock:
+            if not self.queue.seek(i):
+                return  # past either end
         # update UI texts
         self.txt_cur.setPlainText(self.queue.items[self.queue.idx])
-        nxt = self.queue.items[self.queue.idx + 1] if self.queue.idx + 1 < len(self.queue.items) else "(end)"
-        self.txt_nxt.setPlainText(nxt)
-        # play new current (if we have it), then preload next
-        if self.queue.cur_wav:
-            self._play(self.queue.cur_wav)
-        threading.Thread(target=self._preload_next_async, daemon=True).start()
-
-    def _preload_next_async(self) -> None:
-        nxt_i = self.queue.idx + 1
-        if nxt_i < len(self.queue.items):
+        self.txt_nxt.setPlainText(self.queue.text_or_end(self.queue.idx + 1))
+        # play new current (or stream it), then top up the lookahead window
+        if play:
+            self._play_current()
+        self._fill_window(include_current=not self.stream.playing())
+        self._ui_buffer()
+        self._session_timer.start()
+
+    # -------- random access --------
+    def _navigate(self, i: int) -> None:
+        """Stop the current clip and play sentence i (kept neighbours play instantly)."""
+        if not self.btn_next.isEnabled() or i < 0 or not self.queue.items.has(i):
+            return
+        self.started = True
+        self._manual_advance = True
+        self._end_consumed = True   # suppress auto handler for the stopped clip
+        self.player.stop()
+        self.stream.stop()
+        self.gapless.stop()
+        self._step_to(i)
+        self._manual_advance = False
+
+    def go_back(self) -> None:
+        self._navigate(self.queue.idx - 1)
+
+    def go_to_prompt(self) -> None:
+        if not self.btn_next.isEnabled():
+            return
+        n, ok = QtWidgets.QInputDialog.getInt(self, "Go to sentence", "Sentence number:",
+                                              value=self.queue.idx, min=1, max=2 ** 31 - 1)
+        if ok:
+            self._navigate(n)
+
+    def find_prompt(self) -> None:
+        if not self.btn_next.isEnabled():
+            return
+        text, ok = QtWidgets.QInputDialog.getText(self, "Find", "Find sentence containing:",
+                                                  text=self._find_text)
+        if ok and text:
+            self._find_text = text
+            self.find_next()
+
+    def find_next(self) -> None:
+        """Search on a worker thread: a large document may not be fully indexed yet."""
+        if not self._find_text or not self.btn_next.isEnabled():
+            return
+        self._find_seq += 1
+        self._find_queue = q = self.queue
+        self.status.setText(f"Searching for {self._find_text}…")
+        threading.Thread(target=self._find_worker, args=(q, self._find_text, self._find_seq),
+                         daemon=True).start()
+
+    def _find_worker(self, q: AudioQueue, needle: str, seq: int) -> None:
+        i = q.find(needle)
+        QtCore.QMetaObject.invokeMethod(self, "_found", QtCore.Qt.QueuedConnection,
+                                        QtCore.Q_ARG(int, seq), QtCore.Q_ARG(int, -1 if i is None else i))
+
+    @QtCore.pyqtSlot(int, int)
+    def _found(self, seq: int, i: int) -> None:
+        if seq != self._find_seq or self._find_queue is not self.queue:
+            return  # superseded by a newer search or another document
+        if i < 0:
+            self.status.setText(f"Not found: {self._find_text}")
+        else:
+            self._navigate(i)
+
+    def _fill_window(self, include_current: bool = False) -> None:
+        """Keep every sentence in the lookahead window synthesized or in flight, plus the
+        one before the current sentence; release audio and cancel jobs outside q.keep().
+        include_current also schedules the current sentence (e.g. after a jump)."""
+        q = self.queue
+        with self._qlock:
+            win, keep = q.window(), q.keep()
+            for i in [i for i in q.wavs if i not in keep]:
+                q.drop(i)  # deletes spooled audio unless the player still holds it
+            for i in [i for i in q.pending if i not in keep]:
+                fut = q.pending.pop(i, None)  # a cancelled batch already cleared its other sentences
+                if fut is not None:
+                    fut.cancel()  # running jobs finish, but their result is dropped
+            back = [q.idx - 1] if q.behind and q.idx > 0 else []
+            # priority = distance from the current sentence; the one behind goes last.
+            # The current sentence goes alone; the window ahead in runs of batch_size.
+            size = self._backend.batch_size if self._backend is not None else 1
+            runs: List[List[int]] = []
+            for i in ([q.idx] if include_current else []) + list(win) + back:
+                prio = i - q.idx if i >= q.idx else len(win) + 1
+                if i in q.pending:
+                    self.sched.promote(q.pending[i], prio)  # e.g. a jump made it the current one
+                elif i not in q.wavs:
+                    # tiny fragments join the run regardless, so they can be packed with it
+                    if runs and q.idx < runs[-1][-1] == i - 1 and (
+                            len(runs[-1]) < size or len(q.items[i]) < PACK_MIN):
+                        runs[-1].append(i)
+                    else:
+                        runs.append([i])
+            for run in runs:
+                prio = run[0] - q.idx if run[0] >= q.idx else len(win) + 1
+                fut = self.sched.submit(self._synth_batch, [q.items[i] for i in run], priority=prio)
+                for i in run:
+                    q.pending[i] = fut
+                fut.add_done_callback(partial(self._on_prefetched, q, run))
+
+    def _on_prefetched(self, q: AudioQueue, run: List[int], fut: Future) -> None:
+        with self._qlock:
+            for i in run:
+                if q.pending.get(i) is fut:
+                    del q.pending[i]
+            if fut.cancelled():
+                return
             try:
-                wav = self._synth(self.queue.items[nxt_i])
-            except Exception:
-                wav = None
-            if nxt_i == self.queue.idx + 1:
-                self.queue.next_wav = wav
+                paths = fut.result()
+            except Exception as e:
+                log(f"Prefetch of sentences {run} failed: {e}")
+                if q is self.queue and self._wait_idx in run:
+                    self._wait_idx = None
+                    QtCore.QMetaObject.invokeMethod(self, "_ui_err", QtCore.Qt.QueuedConnection,
+                                                    QtCore.Q_ARG(str, f"Synthesis error: {e}"))
+                return
+            # another document was loaded, the window closed, or a bump (e.g. a speed
+            # change) made this job's output stale while it was running
+            if q is not self.queue or fut.generation != self.sched.generation:
+                for path in paths:
+                    spool().discard(path)
+                return
+            for i, path in zip(run, paths):
+                if i not in q.keep():
+                    spool().discard(path)  # finished after the reader moved on
+                    continue
+                q.put(i, path)
+                if i == self._wait_idx:
+                    QtCore.QMetaObject.invokeMethod(self, "_play_waited", QtCore.Qt.QueuedConnection,
+                                                    QtCore.Q_ARG(int, i))
+                elif i == q.idx + 1:  # the gapless stream may be waiting for it
+                    QtCore.QMetaObject.invokeMethod(self, "_gapless_feed", QtCore.Qt.QueuedConnection)
+        QtCore.QMetaObject.invokeMethod(self, "_ui_buffer", QtCore.Qt.QueuedConnection)
 
     def _on_media_status_changed(self, status) -> None:
-        if status != QMediaPlayer.EndOfMedia:
-            return
+        if status == QMediaPlayer.BufferedMedia and self._play_t0:
+            METRICS.observe("play_start", time.perf_counter() - self._play_t0)
+            self._play_t0 = 0.0
+        elif status == QMediaPlayer.EndOfMedia:
+            self._on_clip_end()
+
+    def _on_clip_end(self) -> None:
         # mark that this clip naturally ended
         self._end_consumed = True
     
@@ -459,15 +2911,141 @@ class Main(QtWidgets.QMainWindow):
                 self._advance()
         # else: do nothing; wait for user to press Next/Space
 
-    def _synth(self, text: str) -> str:
-        assert self._backend is not None, "Backend not initialized"
-        return self._backend.synth_to_wav(apply_pron(text, self.rules))
+    def _synth(self, text: str, speed: Optional[float] = None) -> str:
+        backend = self._backend
+        assert backend is not None, "Backend not initialized"
+        speed = self._speed if speed is None else speed
+        with METRICS.span("pron"):
+            spoken = apply_pron(text, self.rules)
+        key = self.cache.key(backend, spoken, speed) if self.cache is not None else None
+        hit = self.cache.get(key) if key else None
+        if hit:
+            return hit
+        t0 = time.perf_counter()
+        with METRICS.span("synth_to_wav", backend=backend.name(), chars=len(spoken)):
+            path = backend.synth_to_wav(spoken, speed)
+        self._note_rtf(backend, time.perf_counter() - t0, wav_seconds(path))
+        if key is None:
+            return path
+        with METRICS.span("cache_put"):
+            return self.cache.put(key, path)
+
+    def _synth_batch(self, texts: List[str]) -> List[str]:
+        """WAV paths for texts: cache hits as they are, the misses packed into units
+        (see synth_units) unless a single sentence of ordinary length is missing."""
+        backend, speed = self._backend, self._speed
+        assert backend is not None, "Backend not initialized"
+        with METRICS.span("pron"):
+            spoken = [apply_pron(t, self.rules) for t in texts]
+        keys = [self.cache.key(backend, s, speed) for s in spoken] if self.cache is not None else []
+        out = [self.cache.get(k) for k in keys] if keys else [None] * len(texts)
+        miss = [j for j, p in enumerate(out) if p is None]
+        if np is None or len(miss) == 1 and len(spoken[miss[0]]) <= PACK_MAX:
+            for j in miss:  # nothing to pack: the plain path, which needs no numpy
+                out[j] = self._synth(texts[j], speed)
+            return out
+        t0 = time.perf_counter()
+        with METRICS.span("synth_units", backend=backend.name(), sentences=len(miss)):
+            pcms = synth_units(backend, [spoken[j] for j in miss], speed)
+        self._note_rtf(backend, time.perf_counter() - t0,
+                       sum(len(p) / float(r) for p, r in pcms), len(miss))
+        for j, (pcm, rate) in zip(miss, pcms):
+            with METRICS.span("wav_write"):
+                out[j] = write_wav_pcm(spool().new_path(), pcm, rate)
+            if keys:
+                with METRICS.span("cache_put"):
+                    out[j] = self.cache.put(keys[j], out[j])
+        return out
+
+    def _set_speed(self, speed: float) -> None:
+        """New speaking speed: buffered audio is at the old one, so resynthesize the window.
+        The clip playing now finishes at its speed."""
+        if speed == self._speed:
+            return  # e.g. stepped away and back within the debounce interval
+        self._speed = speed
+        if not self.queue.items:
+            return
+        with self._qlock:
+            self.queue.cancel_all()
+            self.queue.release_all()
+            self.sched.bump()
+        self._fill_window(include_current=self._wait_idx is not None)
+        self._ui_buffer()
+
+    # -------- adaptive prefetch --------
+    def _note_rtf(self, backend: _BaseTTS, synth_s: float, audio_s: float, n: int = 1) -> None:
+        """Fold one measured synthesis of n sentences into the backend's realtime factor
+        (cache misses only)."""
+        if not ADAPTIVE or audio_s <= 0 or backend is not self._backend:
+            return
+        rtf, per = synth_s / audio_s, audio_s / n
+        with self._rtf_lock:
+            self._rtf = rtf if self._rtf is None else 0.3 * rtf + 0.7 * self._rtf
+            self._sent_s = per if self._sent_s is None else 0.3 * per + 0.7 * self._sent_s
+            rtf = self._rtf
+        METRICS.gauge("realtime_factor", rtf, backend=backend.name())
+        self._retune(rtf)
+
+    def _retune(self, rtf: Optional[float]) -> None:
+        """Size the lookahead window and the worker pool for a realtime factor: a backend
+        slower than playback (RTF > 1) needs more sentences in flight, and more threads
+        where the engine really runs them in parallel; a fast one needs little of either.
+        None resets to the configured starting values."""
+        backend = self._backend
+        cap = min(max(PREFETCH_WORKERS, COQUI_WORKERS), backend.max_parallel if backend else 1)
+        if rtf is None:
+            with self._rtf_lock:
+                self._rtf = self._sent_s = None
+            depth, workers = LOOKAHEAD, max(PREFETCH_WORKERS, COQUI_WORKERS)
+        else:
+            # a reader stepping faster than the audio plays raises the demand by the same
+            # factor; keep the window deep enough to cover a slow stretch with headroom
+            step, sent = self._step_s, self._sent_s
+            need = rtf * max(1.0, sent / step if step and sent else 1.0) * RTF_HEADROOM
+            workers = max(1, min(cap, math.ceil(need)))
+            depth = max(1, min(LOOKAHEAD_MAX, math.ceil(need * 2)))
+        grew = depth > self._lookahead
+        if depth != self._lookahead or workers != self.sched.workers:
+            log(f"prefetch: RTF {'-' if rtf is None else f'{rtf:.2f}'} -> lookahead {depth}, "
+                f"{workers} worker(s)")
+        self._lookahead = depth
+        self.sched.resize(workers)
+        with self._qlock:
+            self.queue.lookahead = depth
+        if grew and rtf is not None and self.queue.items:
+            self._fill_window()  # start on the new part of the window right away
+
+    def closeEvent(self, ev) -> None:
+        self._save_session()
+        self.stream.stop()
+        self.gapless.stop()
+        self.player.stop()
+        self.player.setMedia(QMediaContent())  # let go of the file before it is deleted
+        with self._qlock:
+            self.queue.cancel_all()
+            self.queue.release_all()
+            self.queue = AudioQueue(LazySentences())  # jobs still running now find a stale queue
+        if self._playing is not None:
+            spool().release(self._playing)
+            self._playing = None
+        self.sched.shutdown()
+        self._warmer.shutdown(wait=False, cancel_futures=True)
+        if self._warm is not None:
+            self._warm.add_done_callback(self._drop_backend)
+        if self._backend is not None:
+            self._backend.close()
+        super().closeEvent(ev)
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "export":
+        sys.exit(export_main(sys.argv[2:]))
     app = QtWidgets.QApplication(sys.argv)
     w = Main()
     w.show()
+    log(f"Window shown {(time.perf_counter() - _T0) * 1000:.0f} ms after start")
+    QtCore.QTimer.singleShot(0, w._warm_backend)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # export/Coqui workers in the PyInstaller build
     main()
\ No newline at end of file
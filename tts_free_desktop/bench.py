@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TTS Free — benchmarks for the text and synthesis pipeline
+
+    python bench.py                          # run every benchmark
+    python bench.py pron seg                 # only the named ones
+    python bench.py --save base.json         # store the results as a baseline
+    python bench.py --compare base.json      # exit 1 if anything regressed beyond --tolerance
+
+Synthesis is measured with FakeBackend, a deterministic engine with configurable
+latency, so the pipeline can be timed without any models; real engines are added
+to the "backends" run when they are installed. Set TTS_FREE_DEBUG=1 for app logs.
+Numbers are best-of-N wall times.
+"""
+
+from __future__ import annotations
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # importing app must not need a display
+
+import re, sys, json, time, random, shutil, string, argparse, platform, tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+import app
+
+RESULTS: Dict[str, Tuple[float, str]] = {}  # "bench/metric" -> (value, unit)
+_BENCH = ""                                 # benchmark currently running
+_LOWER_IS_BETTER = {"us", "ms", "s", "MB", "rtf", "Hz"}
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def report(name: str, value: float, unit: str) -> None:
+    RESULTS[f"{_BENCH}/{name.strip()}"] = (float(value), unit)
+    print(f"  {name:<38} {value:>12.3f} {unit}")
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KiB elsewhere
+
+# ---------- fake engine ----------
+class FakeBackend(app._BaseTTS):
+    """Deterministic stand-in engine: each call costs latency + per_char * len(text)
+    seconds and returns a tone of SEC_PER_CHAR seconds per character (roughly speech
+    pace). iter_pcm delivers the first chunk after first_chunk seconds. It has no rate
+    control of its own, so other speeds go through app.time_stretch."""
+    RATE = 22050
+    SEC_PER_CHAR = 0.07
+    max_parallel = 4  # sleeps, so calls overlap like a process-per-call engine
+
+    def __init__(self, latency: float = 0.02, per_char: float = 0.0002, first_chunk: float = 0.01) -> None:
+        self.latency, self.per_char, self.first_chunk = latency, per_char, first_chunk
+        self._tone = (app.np.sin(app.np.arange(self.RATE // 100) * 0.3) * 8000).astype(app.np.int16)
+
+    def _pcm(self, text: str) -> "app.np.ndarray":
+        return app.np.resize(self._tone, int(self.RATE * self.SEC_PER_CHAR * max(1, len(text))))
+
+    def synth_to_pcm(self, text: str, speed: float = 1.0) -> app.Pcm:
+        time.sleep(self.latency + self.per_char * len(text))
+        return app.time_stretch(self._pcm(text), self.RATE, speed), self.RATE
+
+    def synth_to_wav(self, text: str, speed: float = 1.0) -> str:
+        pcm, rate = self.synth_to_pcm(text, speed)
+        return app.write_wav_pcm(app.spool().new_path(), pcm, rate)
+
+    def iter_pcm(self, text: str, speed: float = 1.0):
+        time.sleep(self.first_chunk)
+        pcm = app.time_stretch(self._pcm(text), self.RATE, speed)
+        step = self.RATE // 2
+        rest = max(0.0, self.latency + self.per_char * len(text) - self.first_chunk)
+        for k in range(0, len(pcm), step):
+            if k:
+                time.sleep(rest * step / len(pcm))
+            yield pcm[k:k + step], self.RATE
+
+    def name(self) -> str: return "Fake"
+    def cache_params(self) -> dict: return {"latency": self.latency, "per_char": self.per_char}
+
+def _prose(rng: random.Random, n_sents: int) -> List[str]:
+    words = _random_words(rng, 2000)
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(5, 25))).capitalize() + rng.choice(".!?")
+            for _ in range(n_sents)]
+
+# ---------- pronunciation rules ----------
+def apply_pron_loop(text: str, rules: List[Tuple[str, str]]) -> str:
+    """The original one-re.sub-per-rule implementation, kept as the baseline."""
+    out = text
+    for term, rep in rules:
+        out = re.sub(rf"\b{re.escape(term)}\b", rep, out, flags=re.IGNORECASE)
+    return out
+
+def _random_words(rng: random.Random, n: int) -> List[str]:
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+def bench_pron(n_rules: int = 10_000, n_sents: int = 200, n_legacy: int = 10) -> None:
+    print(f"pron: {n_rules} rules, {n_sents} sentences")
+    rng = random.Random(7)
+    terms = _random_words(rng, n_rules)
+    # replacements contain digits, so they can never re-match a term (no rule chaining)
+    rules = [(t, f"{t[:2]}{i}") for i, t in enumerate(terms)]
+    filler = _random_words(random.Random(8), 500)
+    sents = [" ".join(rng.choice(terms) if rng.random() < 0.2 else rng.choice(filler)
+                      for _ in range(rng.randint(8, 30))).capitalize() + "."
+             for _ in range(n_sents)]
+
+    report("compile (PronRules)", best_of(lambda: app.PronRules(rules), 1) * 1e3, "ms")
+    compiled = app.PronRules(rules)
+    for s in sents[:n_legacy]:
+        assert compiled.apply(s) == apply_pron_loop(s, rules), s
+    legacy = best_of(lambda: [apply_pron_loop(s, rules) for s in sents[:n_legacy]], 1) / n_legacy
+    fast = best_of(lambda: [compiled.apply(s) for s in sents]) / n_sents
+    report("per sentence, re.sub loop", legacy * 1e3, "ms")
+    report("per sentence, compiled", fast * 1e3, "ms")
+    report("speedup", legacy / fast, "x")
+
+# ---------- sentence segmentation ----------
+_LEGACY_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def split_sentences_regex(text: str) -> List[str]:
+    """The previous single-regex splitter, kept as the baseline."""
+    out, pos = [], 0
+    for m in _LEGACY_BREAK.finditer(text):
+        seg = text[pos:m.start()]
+        lead, keep = len(seg) - len(seg.lstrip()), len(seg.rstrip())
+        if keep > lead:
+            out.append(text[pos + lead:pos + keep])
+        pos = m.end()
+    seg = text[pos:]
+    lead, keep = len(seg) - len(seg.lstrip()), len(seg.rstrip())
+    if keep > lead:
+        out.append(text[pos + lead:pos + keep])
+    return out
+
+# (text, expected sentences): the cases the regex got wrong, plus ones it must keep right
+SEG_CORPUS: List[Tuple[str, List[str]]] = [
+    ("Dr. Smith went to Washington. He arrived on Monday.",
+     ["Dr. Smith went to Washington.", "He arrived on Monday."]),
+    ("See e.g. the appendix, i.e. the last part. It is long.",
+     ["See e.g. the appendix, i.e. the last part.", "It is long."]),
+    ("It costs 3.50 today. Prices rose 2.5% in 2023.",
+     ["It costs 3.50 today.", "Prices rose 2.5% in 2023."]),
+    ("J. R. R. Tolkien wrote it. So did I. Then we left.",
+     ["J. R. R. Tolkien wrote it.", "So did I.", "Then we left."]),
+    ("The U.S. Army arrived at 5 p.m. on time. Everyone cheered.",
+     ["The U.S. Army arrived at 5 p.m. on time.", "Everyone cheered."]),
+    ("I live in the U.S. It is big.", ["I live in the U.S.", "It is big."]),
+    ("Meet at 5 p.m. Then we go.", ["Meet at 5 p.m.", "Then we go."]),
+    ('"Stop!" she cried. "Why?" He did not answer.',
+     ['"Stop!" she cried.', '"Why?"', "He did not answer."]),
+    ("He waited... and waited. Nothing… Then a knock!",
+     ["He waited... and waited.", "Nothing…", "Then a knock!"]),
+    ("She left (for good.) Nobody followed. [Or did they?] Maybe.",
+     ["She left (for good.)", "Nobody followed.", "[Or did they?]", "Maybe."]),
+    ("See No. 5 and Fig. 3 on p. 12. No. That was wrong.",
+     ["See No. 5 and Fig. 3 on p. 12.", "No.", "That was wrong."]),
+    ("It was late etc. The end.", ["It was late etc.", "The end."]),
+    ("1. Introduction\n2. Methods\nChapter One\n\n  Indented line.  ",
+     ["1. Introduction", "2. Methods", "Chapter One", "Indented line."]),
+    ("Mr. and Mrs. Jones met Prof. Li vs. Gen. Ray in Jan. 2020. Who won?",
+     ["Mr. and Mrs. Jones met Prof. Li vs. Gen. Ray in Jan. 2020.", "Who won?"]),
+    ("What?! Really? Yes!", ["What?!", "Really?", "Yes!"]),
+]
+
+def bench_seg(mb: float = 8.0) -> None:
+    print(f"seg: {len(SEG_CORPUS)} corpus cases, {mb:g} MB text")
+    failed = 0
+    for text, want in SEG_CORPUS:
+        got = app.split_sentences(text)
+        if got != want:
+            failed += 1
+            print(f"  MISMATCH {text!r}\n    want {want}\n    got  {got}")
+    legacy_ok = sum(split_sentences_regex(t) == w for t, w in SEG_CORPUS)
+    report("corpus correct, segmenter", len(SEG_CORPUS) - failed, f"/ {len(SEG_CORPUS)}")
+    report("corpus correct, regex", legacy_ok, f"/ {len(SEG_CORPUS)}")
+
+    # realistic prose: corpus lines and plain sentences, one paragraph per line
+    rng = random.Random(3)
+    words = _random_words(rng, 2000)
+    plain = [" ".join(rng.choice(words) for _ in range(rng.randint(5, 25))).capitalize() + rng.choice(".!?")
+             for _ in range(500)]
+    paras, size = [], 0
+    while size < mb * 1e6:
+        p = " ".join(rng.choice(plain) if rng.random() < 0.8 else rng.choice(SEG_CORPUS)[0].replace("\n", " ")
+                     for _ in range(rng.randint(3, 12)))
+        paras.append(p)
+        size += len(p) + 1
+    text = "\n".join(paras)
+    new = best_of(lambda: app.split_sentences(text))
+    old = best_of(lambda: split_sentences_regex(text))
+    report("throughput, regex", size / 1e6 / old, "MB/s")
+    report("throughput, segmenter", size / 1e6 / new, "MB/s")
+    report("relative", old / new, "x")
+
+# ---------- batched synthesis ----------
+BATCH_TEXT = ("The quick brown fox jumps over the lazy dog. Where are you going? "
+              "It was late. She read the letter twice before she put it down. "
+              "Nobody answered. The train left at seven, and we missed it by a minute.")
+
+def bench_batch(sizes: Tuple[int, ...] = (1, 4, 16), n_sents: int = 32) -> None:
+    print(f"batch: {n_sents} sentences through Coqui synth_batch")
+    if not app.COQUI_OK:
+        print("  skipped: Coqui TTS is not installed")
+        return
+    backend = app.CoquiBackend("p240")
+    sents = (app.split_sentences(BATCH_TEXT) * n_sents)[:n_sents]
+    backend.synth_batch(sents[:2])  # warm-up
+    base = None
+    for size in sizes:
+        backend.batch_size = size
+        sec = best_of(lambda: backend.synth_batch(sents), 1)
+        base = base or sec
+        report(f"batch size {size:>2}", n_sents / sec, "sent/s")
+        report(f"  speedup vs size {sizes[0]}", base / sec, "x")
+
+# ---------- speed ----------
+def bench_stretch(seconds: float = 10.0, speeds: Tuple[float, ...] = (1.25, 1.5, 2.0)) -> None:
+    """WSOLA time-stretch, the speed fallback for engines without a rate control; it runs
+    in prefetch, so it only has to stay well ahead of playback."""
+    rate = 22050
+    print(f"stretch: {seconds:.0f} s of speech-like audio at {rate} Hz")
+    rng = app.np.random.default_rng(3)
+    t = app.np.arange(int(seconds * rate)) / rate
+    # voiced harmonics with a syllable-rate envelope, plus a little noise
+    pcm = (app.np.sin(2 * app.np.pi * 140 * t) + 0.5 * app.np.sin(2 * app.np.pi * 280 * t))
+    pcm = pcm * (0.6 + 0.4 * app.np.sin(2 * app.np.pi * 4 * t)) + 0.05 * rng.standard_normal(len(t))
+    pcm = (pcm * 8000).astype(app.np.int16)
+    def pitch(a: "app.np.ndarray") -> float:  # strongest partial, in Hz
+        return float(app.np.argmax(abs(app.np.fft.rfft(a))) * rate / len(a))
+
+    for speed in speeds:
+        sec = best_of(lambda: app.time_stretch(pcm, rate, speed))
+        out = app.time_stretch(pcm, rate, speed)
+        report(f"{speed}x, audio per second of CPU", seconds / sec, "x")
+        report(f"{speed}x, pitch drift", abs(pitch(out) - pitch(pcm)), "Hz")
+
+# ---------- text pipeline ----------
+def bench_text(mb: float = 4.0, n_rules: int = 200) -> None:
+    print(f"text: {mb:g} MB .txt, {n_rules} pronunciation rules")
+    rng = random.Random(11)
+    sents = _prose(rng, 1000)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", encoding="utf-8", delete=False) as f:
+        size = 0
+        while size < mb * 1e6:
+            line = " ".join(rng.choice(sents) for _ in range(rng.randint(3, 12))) + "\n"
+            f.write(line)
+            size += len(line)
+        path = f.name
+    try:
+        report("read_text", size / 1e6 / best_of(lambda: app.read_text(path)), "MB/s")
+        text = app.read_text(path)
+        report("split_sentences", size / 1e6 / best_of(lambda: app.split_sentences(text)), "MB/s")
+        report("iter_sentences (streamed)", size / 1e6 / best_of(lambda: sum(1 for _ in app.iter_sentences(path))), "MB/s")
+        terms = _random_words(random.Random(12), n_rules)
+        rules = app.PronRules([(t, t.upper()) for t in terms])
+        sample = sents[:500]
+        report("apply_pron per sentence", best_of(lambda: [app.apply_pron(s, rules) for s in sample])
+               / len(sample) * 1e6, "us")
+    finally:
+        os.remove(path)
+
+# ---------- engines ----------
+def _engines() -> List[Tuple[str, Callable[[], app._BaseTTS]]]:
+    return [("fake", lambda: FakeBackend()),
+            ("piper", lambda: app.PiperBackend()),
+            ("espeak", lambda: app.EspeakBackend()),
+            ("coqui", lambda: app.CoquiBackend("p240"))]
+
+def bench_backends(n_sents: int = 12) -> None:
+    print(f"backends: {n_sents} sentences each; time to first audio, realtime factor, throughput")
+    sents = (app.split_sentences(BATCH_TEXT) * n_sents)[:n_sents]
+    for label, make in _engines():
+        try:
+            backend = make()
+            backend.warm_up()
+        except Exception as e:
+            print(f"  {label}: skipped ({str(e).splitlines()[0]})")
+            continue
+        try:
+            firsts = []
+            for s in sents:
+                t0 = time.perf_counter()
+                chunks = backend.iter_pcm(s)
+                next(chunks)
+                firsts.append(time.perf_counter() - t0)
+                for _ in chunks:
+                    pass
+            t0 = time.perf_counter()
+            audio = sum(len(pcm) / rate for pcm, rate in (backend.synth_to_pcm(s) for s in sents))
+            wall = time.perf_counter() - t0
+            report(f"{label}: time to first audio", sum(firsts) / len(firsts) * 1e3, "ms")
+            report(f"{label}: realtime factor", wall / audio, "rtf")
+            report(f"{label}: throughput", n_sents / wall, "sent/s")
+        finally:
+            backend.close()
+
+# ---------- reading queue ----------
+def bench_queue(steps: int = 60, read_sec: float = 0.04, latency: float = 0.03) -> None:
+    """The GUI's real prefetch path (Main with the scheduler, queue and spool) driven
+    headlessly: the reader steps every read_sec while FakeBackend needs ~latency per sentence."""
+    print(f"queue: {steps} steps, {read_sec * 1e3:.0f} ms per sentence, fake engine {latency * 1e3:.0f} ms + per char")
+    from PyQt5 import QtWidgets
+    qa = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    backend = FakeBackend(latency=latency)
+    build, app.build_backend = app.build_backend, lambda *a, **k: backend
+    tmp = tempfile.mkdtemp(prefix="tts_free-bench-")
+    doc = os.path.join(tmp, "doc.txt")
+    with open(doc, "w", encoding="utf-8") as f:
+        f.write("\n".join(_prose(random.Random(5), steps + 20)))
+    w = app.Main()
+    try:
+        w.cache = None  # measure synthesis, not cache hits from a previous run
+        w.sessions = app.SessionStore(os.path.join(tmp, "sessions.json"))
+        w.chk_stream.setChecked(False)
+        plays: List[float] = []
+        w._play = lambda path: plays.append(time.perf_counter())
+
+        def pump(until: Callable[[], bool], limit: float = 10.0) -> None:
+            end = time.perf_counter() + limit
+            while not until() and time.perf_counter() < end:
+                qa.processEvents()
+                time.sleep(0.001)
+
+        t0 = time.perf_counter()
+        w._prepare(doc, 0)
+        w.started = True
+        w._play_current()
+        report("load to first audio", (plays[0] - t0) * 1e3, "ms")
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            n = len(plays)
+            pump(lambda: time.perf_counter() - plays[-1] >= read_sec)
+            w._advance()
+            pump(lambda: len(plays) > n)
+        wall = time.perf_counter() - t0
+        report("prefetch hit rate", 100.0 * (1 - w._misses / max(1, w._steps)), "%")
+        report("mean wait on a miss", w._wait_total / max(1, w._waits) * 1e3, "ms")
+        report("sentences/s", steps / wall, "sent/s")
+    finally:
+        w.close()
+        app.build_backend = build
+        shutil.rmtree(tmp, ignore_errors=True)
+
+BENCHES = {
+    "text": bench_text,
+    "pron": bench_pron,
+    "seg": bench_seg,
+    "backends": bench_backends,
+    "queue": bench_queue,
+    "batch": bench_batch,
+    "stretch": bench_stretch,
+}
+
+def compare(baseline: dict, tolerance: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than tolerance (a fraction)."""
+    worse = []
+    for key, (value, unit) in RESULTS.items():
+        old = baseline.get(key)
+        if not old or not old["value"]:
+            continue
+        change = value / old["value"] - 1
+        if (change if unit in _LOWER_IS_BETTER else -change) > tolerance:
+            worse.append(f"{key}: {old['value']:.3f} -> {value:.3f} {unit} ({change:+.0%})")
+    return worse
+
+def main(argv: List[str]) -> int:
+    global _BENCH
+    ap = argparse.ArgumentParser(prog="bench.py", description="TTS Free benchmarks")
+    ap.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHES)}")
+    ap.add_argument("--save", metavar="JSON", help="write the results as a baseline")
+    ap.add_argument("--compare", metavar="JSON", help="compare with a saved baseline")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before --compare fails (0.2 = 20%%)")
+    args = ap.parse_args(argv)
+    names = args.names or list(BENCHES)
+    unknown = [n for n in names if n not in BENCHES]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(BENCHES)}", file=sys.stderr)
+        return 2
+    for n in names:
+        _BENCH = n
+        BENCHES[n]()
+    _BENCH = "process"
+    rss = peak_rss_mb()
+    if rss is not None:
+        report("peak RSS", rss, "MB")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "metrics": {k: {"value": v, "unit": u} for k, (v, u) in RESULTS.items()}}, f, indent=1)
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            worse = compare(json.load(f)["metrics"], args.tolerance)
+        for line in worse:
+            print(f"REGRESSION {line}")
+        if worse:
+            return 1
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))